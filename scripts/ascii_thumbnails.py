@@ -0,0 +1,94 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from session_assets import add_build_args, load_json, update_image_manifest
+
+# --------------------------- Defaults ----------------------------------------
+ASCII_WIDTHS: Sequence[int] = (24, 48, 80)     # columns per thumbnail
+CHAR_RAMP: str = "@%#*+=-:. "                   # dark -> light, for dark text on the light page
+CELL_ASPECT: float = 0.5                        # monospace cell width / height
+ASCII_MANIFEST: str = "ascii-thumbnails.json"   # at the root of the sessions tree
+SAMPLE_PX_PER_CELL: int = 4                     # pre-shrink so each cell averages ~4x4 source pixels
+
+# --------------------------- Conversion --------------------------------------
+def luminance(im: Image.Image) -> np.ndarray:
+    """Rec. 709 luma as float32 in [0, 255]; transparency is flattened onto white."""
+    rgba = np.asarray(im.convert("RGBA"), dtype=np.float32)
+    alpha = rgba[..., 3:4] / 255.0
+    rgb = rgba[..., :3] * alpha + 255.0 * (1.0 - alpha)
+    return rgb @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+def block_means(lum: np.ndarray, cols: int, rows: int) -> np.ndarray:
+    """Average lum over a rows x cols grid of (nearly) equal blocks."""
+    h, w = lum.shape
+    row_edges = np.linspace(0, h, rows + 1).astype(int)[:-1]
+    col_edges = np.linspace(0, w, cols + 1).astype(int)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(lum, row_edges, axis=0), col_edges, axis=1)
+    heights = np.diff(np.append(row_edges, h))[:, None]
+    widths = np.diff(np.append(col_edges, w))[None, :]
+    return sums / (heights * widths)
+
+def to_ascii(lum: np.ndarray, cols: int, ramp: str = CHAR_RAMP) -> List[str]:
+    """Map a luminance array to `cols` columns of ramp characters, stretching contrast to the 2nd-98th percentile."""
+    h, w = lum.shape
+    cols = max(1, min(cols, w))
+    rows = max(1, min(h, round(h / w * cols * CELL_ASPECT)))
+    cells = block_means(lum, cols, rows)
+    lo, hi = np.percentile(cells, [2, 98])
+    norm = np.clip((cells - lo) / (hi - lo), 0.0, 1.0) if hi > lo else np.full_like(cells, 0.5)
+    chars = np.array(list(ramp))
+    grid = chars[np.rint(norm * (len(ramp) - 1)).astype(int)]
+    return ["".join(row) for row in grid]
+
+def build_thumbnails(root: str, rel: str, widths: Sequence[int], ramp: str) -> Dict[str, Dict[str, str]]:
+    """ASCII renderings of one image at every width, as a manifest entry. Runs in a worker process."""
+    with Image.open(Path(root) / rel) as opened:
+        opened.draft("RGB", (max(widths) * SAMPLE_PX_PER_CELL, max(widths) * SAMPLE_PX_PER_CELL))
+        im = ImageOps.exif_transpose(opened)
+        im.thumbnail((max(widths) * SAMPLE_PX_PER_CELL, max(widths) * SAMPLE_PX_PER_CELL * 4))
+        lum = luminance(im)
+    return {"ascii": {str(w): "\n".join(to_ascii(lum, w, ramp)) for w in widths}}
+
+# --------------------------- Pipeline ----------------------------------------
+def build_tree(root: Path,
+               widths: Sequence[int] = ASCII_WIDTHS,
+               ramp: str = CHAR_RAMP,
+               workers: Optional[int] = None,
+               force: bool = False,
+               sessions: Optional[Sequence[int]] = None) -> Dict[str, int]:
+    """
+    Write ASCII thumbnails for every session image under root to
+    root/ascii-thumbnails.json. Results are cached by sha256: unchanged files are
+    skipped, and identical files in several places are converted once.
+    """
+    widths = sorted(set(widths))
+    return update_image_manifest(
+        root, ASCII_MANIFEST, {"widths": widths, "ramp": ramp},
+        build_thumbnails, (widths, ramp), workers=workers, force=force, sessions=sessions, dedupe=True,
+    )
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render session images as ASCII thumbnails for instant placeholders.")
+    add_build_args(parser)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(ASCII_WIDTHS), help="Thumbnail widths in columns.")
+    parser.add_argument("--ramp", type=str, default=CHAR_RAMP, help="Characters from darkest to lightest.")
+    parser.add_argument("--show", type=str, default="", help="Print the thumbnails of this image (path relative to --input).")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    stats = build_tree(Path(args.input), args.widths, args.ramp, args.workers, args.force)
+    print(f"Converted {stats['processed']} images, skipped {stats['skipped']} cached, "
+          f"removed {stats['removed']} stale, {stats['failed']} failed.")
+    if args.show:
+        entry = (load_json(Path(args.input) / ASCII_MANIFEST, {}) or {}).get("images", {}).get(args.show)
+        for width, art in (entry or {}).get("ascii", {}).items():
+            print(f"\n[{width} columns]\n{art}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import generate_ascii_header
+from local_server import LocalServer, QuietHandler
+from scrape_images_from_notion import BaseNotionImageScraper
+
+# --------------------------- Defaults ----------------------------------------
+DEFAULT_REPEAT: int = 5
+BENCH_SCHEMA_VERSION: int = 1
+
+# A minimal valid PNG signature; image bodies are padded out to the requested size.
+PNG_MAGIC: bytes = b"\x89PNG\r\n\x1a\n"
+
+# --------------------------- Timing ------------------------------------------
+def time_call(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Run fn `repeat` times and summarise wall-clock seconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "max_s": max(samples),
+    }
+
+# --------------------------- Synthetic Notion HTML ---------------------------
+def generate_notion_html(sessions: int, images_per_session: int, depth: int,
+                         paragraphs: int = 3, seed: int = 0) -> str:
+    """
+    Build a page shaped like a rendered Notion export: one toggle block per session
+    (newest first) with a 'Session {n}' heading, text and images wrapped `depth`
+    divs deep, plus the script/style noise a real page carries.
+    """
+    rng = random.Random(seed)
+    words = ["demo", "build", "hardware", "agent", "pizza", "robot", "compiler", "grid"]
+    out = [
+        "<html><head><style>.notion-page-content{}</style>",
+        "<script>window.__notion = {session: 'Session 0'};</script></head>",
+        '<body><div class="notion-page-content">',
+    ]
+    for n in range(sessions, 0, -1):
+        out.append('<div class="notion-toggle-block"><div>')
+        out.append('<div role="button" aria-expanded="true"></div>')
+        out.append(f'<h3 class="notion-header-block">Session {n}</h3></div><div>')
+        for i in range(1, images_per_session + 1):
+            out.append("<div>" * depth)
+            for _ in range(paragraphs):
+                out.append("<p>" + " ".join(rng.choice(words) for _ in range(24)) + "</p>")
+            out.append(f'<img src="/image/session{n}/image{i}.png?table=block&amp;id={n}-{i}">')
+            out.append("</div>" * depth)
+        out.append("</div></div>")
+    out.append("</div></body></html>")
+    return "".join(out)
+
+# --------------------------- Local image server ------------------------------
+class _ImageHandler(QuietHandler):
+    def do_GET(self):
+        server = self.owner
+        time.sleep(server.latency)
+        status = server._should_fail()
+        if status:
+            headers = {"Retry-After": f"{server.retry_after:g}"} if server.retry_after is not None else {}
+            self.send_body(status, headers=headers)
+            return
+        self.send_body(200, server.body, "image/png")
+        with server._lock:
+            server.bytes_sent += len(server.body)
+
+class ImageServer(LocalServer):
+    """
+    Stand-in for Notion's image host on 127.0.0.1. Every GET returns a PNG-ish body
+    of `image_size` bytes after `latency` seconds, or a 503 with probability
+    `failure_rate` (seeded, so runs are repeatable), carrying a Retry-After header
+    when `retry_after` is set. With `rate_limit`, requests beyond that many per
+    second are answered 429, like a throttling CDN.
+    """
+
+    handler = _ImageHandler
+
+    def __init__(self, latency: float = 0.05, image_size: int = 200_000,
+                 failure_rate: float = 0.0, seed: int = 0, retry_after: Optional[float] = None,
+                 rate_limit: Optional[float] = None):
+        super().__init__()
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self._tokens = rate_limit or 0.0
+        self._refilled = time.monotonic()
+        self.body = PNG_MAGIC + b"\0" * max(0, image_size - len(PNG_MAGIC))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.bytes_sent = 0
+
+    def _should_fail(self) -> Optional[int]:
+        """Status to fail this request with (429 over the rate limit, seeded 503), or None."""
+        with self._lock:
+            self.requests += 1
+            status = None
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                else:
+                    status = 429
+            if status is None and self._rng.random() < self.failure_rate:
+                status = 503
+            if status:
+                self.failures += 1
+            return status
+
+class OfflineScraper(BaseNotionImageScraper):
+    """Scraper whose 'rendered page' is a fixed HTML string."""
+
+    def __init__(self, html: str, notion_url: str, output_root: str, **kwargs):
+        super().__init__(notion_url, output_root, **kwargs)
+        self.html = html
+
+    def get_fully_rendered_html(self) -> str:
+        return self.html
+
+# --------------------------- Benchmarks --------------------------------------
+def bench_extraction(sessions: int, images_per_session: int, depth: int,
+                     repeat: int) -> List[dict]:
+    html = generate_notion_html(sessions, images_per_session, depth)
+    params = {"sessions": sessions, "images_per_session": images_per_session,
+              "depth": depth, "html_bytes": len(html.encode("utf-8"))}
+    extractors = {
+        "stream": BaseNotionImageScraper.collect_images_by_session,
+        "tree": BaseNotionImageScraper.collect_images_by_session_tree,
+    }
+    results = []
+    for name, collect in extractors.items():
+        found = collect(html)
+        results.append({
+            "name": f"extract.{name}",
+            "params": params,
+            "images_found": sum(len(v) for v in found.values()),
+            **time_call(lambda: collect(html), repeat),
+        })
+    return results
+
+def bench_downloads(sessions: int, images_per_session: int, latency: float,
+                    image_size: int, failure_rate: float, workers: int,
+                    per_host: int, repeat: int, retry_after: Optional[float] = None,
+                    rate_limit: Optional[float] = None) -> dict:
+    html = generate_notion_html(sessions, images_per_session, depth=1, paragraphs=0)
+    params = {"sessions": sessions, "images_per_session": images_per_session,
+              "latency_s": latency, "image_size": image_size, "failure_rate": failure_rate,
+              "retry_after_s": retry_after, "rate_limit": rate_limit,
+              "workers": workers, "per_host": per_host}
+    saved: List[int] = []
+    retries: List[int] = []
+    with ImageServer(latency, image_size, failure_rate, retry_after=retry_after,
+                     rate_limit=rate_limit) as server:
+        images = BaseNotionImageScraper.collect_images_by_session(html)
+
+        def run():
+            # Fresh output root each run so the sync manifest never short-circuits.
+            with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+                scraper = OfflineScraper(html, server.base_url, tmp,
+                                         workers=workers, per_host=per_host)
+                saved.append(scraper.download_images(images))
+                retries.append(scraper.metrics.report()["downloads"]["retries"])
+
+        timing = time_call(run, repeat)
+        requests_made, failures, bytes_sent = server.requests, server.failures, server.bytes_sent
+
+    return {
+        "name": "download",
+        "params": params,
+        "images_saved": saved[-1],
+        "requests": requests_made,
+        "failed_requests": failures,
+        "retries": retries[-1],
+        "bytes_per_run": bytes_sent // repeat,
+        "images_per_s": saved[-1] / timing["median_s"] if timing["median_s"] else None,
+        **timing,
+    }
+
+def bench_ascii(repeat: int) -> List[dict]:
+    def print_js():
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_ascii_header.print_ascii_for_javascript(generate_ascii_header.create_demos_ascii())
+
+    cases = {
+        "ascii.create_demos_ascii": generate_ascii_header.create_demos_ascii,
+        "ascii.create_demos_ascii_jules_style": generate_ascii_header.create_demos_ascii_jules_style,
+        "ascii.print_ascii_for_javascript": print_js,
+    }
+    return [{"name": name, "params": {}, **time_call(fn, repeat)} for name, fn in cases.items()]
+
+# --------------------------- CLI / Main --------------------------------------
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=Path(__file__).parent, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the Notion scraper and ASCII generators.")
+    parser.add_argument("-o", "--output", type=str, default="", help="Write the JSON report here (default: stdout).")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case.")
+    parser.add_argument("--only", type=str, nargs="*", choices=["extract", "download", "ascii"],
+                        default=["extract", "download", "ascii"], help="Benchmark groups to run.")
+
+    # Synthetic page shape
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 45], help="Session counts to generate.")
+    parser.add_argument("--images-per-session", type=int, default=4, help="Images under each session heading.")
+    parser.add_argument("--depth", type=int, nargs="+", default=[2, 8], help="Div nesting depth around each image.")
+
+    # Local image server
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the image server waits per request.")
+    parser.add_argument("--image-size", type=int, default=200_000, help="Bytes per served image.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with each 429/503.")
+    parser.add_argument("--rate-limit", type=float, default=None,
+                        help="Requests/s the image server accepts before answering 429.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8], help="Download worker counts to compare.")
+    parser.add_argument("--per-host", type=int, default=6, help="Per-host connection cap for downloads.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results: List[dict] = []
+
+    if "extract" in args.only:
+        for sessions in args.sessions:
+            for depth in args.depth:
+                results += bench_extraction(sessions, args.images_per_session, depth, args.repeat)
+
+    if "download" in args.only:
+        for workers in args.workers:
+            results.append(bench_downloads(
+                min(args.sessions), args.images_per_session, args.latency, args.image_size,
+                args.failure_rate, workers, args.per_host, args.repeat, args.retry_after,
+                args.rate_limit,
+            ))
+
+    if "ascii" in args.only:
+        results += bench_ascii(max(args.repeat, 100))
+
+    report = {
+        "schema": BENCH_SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import argparse
+import os
+import shutil
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from session_assets import (
+    SCRAPER_SESSIONS_DIR, SITE_SESSIONS_DIR, file_sha256, iter_session_images, load_json, write_json_atomic,
+)
+
+# --------------------------- Defaults ----------------------------------------
+IMAGE_STORE_DIR: Path = Path(__file__).resolve().parent.parent / ".image-store"
+LINK_MODES = ("hardlink", "symlink")
+DEFAULT_ROOTS = (SITE_SESSIONS_DIR, SCRAPER_SESSIONS_DIR)
+ROOTS_FILE: str = "roots.json"  # every tree linked into the store, and how
+NEAR_DUPLICATE_BITS: int = 6  # max differing bits (of 64) for two images to count as near-duplicates
+
+# --------------------------- Blob store --------------------------------------
+class BlobStore:
+    """
+    Content-addressed image store: every unique file lives once at
+    objects/<first two hex chars>/<sha256>, and session{N}/image{i} paths are
+    hardlinks (default) or relative symlinks to it. Hardlinks fall back to a copy
+    when the store and the tree sit on different filesystems. Each tree linked
+    into the store is recorded in roots.json, so gc knows which trees it must see.
+    """
+
+    def __init__(self, root: Path = IMAGE_STORE_DIR, mode: str = "hardlink"):
+        if mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode {mode!r}; expected one of {LINK_MODES}")
+        self.root = Path(root)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._warned_copy = False
+        self.roots: Dict[str, str] = (load_json(self.root / ROOTS_FILE, {}) or {}).get("roots", {})
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def put_file(self, src: Path, digest: Optional[str] = None, move: bool = False) -> str:
+        """Add src to the store (moving it if move=True) and return its sha256."""
+        digest = digest or file_sha256(src)
+        blob = self.blob_path(digest)
+        with self._lock:
+            if blob.exists():
+                if move:
+                    Path(src).unlink()
+                return digest
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            if move:
+                os.replace(src, blob)
+            else:
+                tmp = blob.with_name(blob.name + ".tmp")
+                try:
+                    os.link(src, tmp)  # existing file becomes the blob without copying
+                except OSError:
+                    shutil.copyfile(src, tmp)
+                os.replace(tmp, blob)
+        return digest
+
+    def record_root(self, root: Path) -> None:
+        """Remember that root's session{N}/ paths link into the store in this store's mode."""
+        key = str(Path(root).resolve())
+        with self._lock:
+            if self.roots.get(key) in ("symlink", self.mode):  # symlink wins: gc must always see that tree
+                return
+            self.roots[key] = self.mode
+            self.root.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.root / ROOTS_FILE, {"version": 1, "roots": self.roots})
+
+    def link(self, digest: str, dest: Path) -> None:
+        """Atomically point dest (a root/session{N}/ file) at the blob for digest."""
+        blob = self.blob_path(digest)
+        dest = Path(dest)
+        self.record_root(dest.parent.parent)
+        tmp = dest.with_name(dest.name + ".link")
+        tmp.unlink(missing_ok=True)
+        if self.mode == "symlink":
+            os.symlink(os.path.relpath(blob, dest.parent), tmp)
+        else:
+            try:
+                os.link(blob, tmp)
+            except OSError as e:
+                if not self._warned_copy:
+                    print(f"[WARN] Hardlink into {self.root} failed ({e}); copying instead.")
+                    self._warned_copy = True
+                shutil.copyfile(blob, tmp)
+        os.replace(tmp, dest)
+
+    def is_linked(self, path: Path, digest: str) -> bool:
+        """Whether path already points at the blob the way this store's mode links it."""
+        path, blob = Path(path), self.blob_path(digest)
+        try:
+            if self.mode == "symlink":
+                return path.is_symlink() and path.resolve() == blob.resolve(strict=True)
+            return not path.is_symlink() and os.path.samefile(path, blob)
+        except OSError:
+            return False
+
+    def iter_blobs(self) -> Iterable[Path]:
+        objects = self.root / "objects"
+        if objects.is_dir():
+            yield from (p for p in sorted(objects.glob("*/*")) if p.is_file() and not p.name.endswith(".tmp"))
+
+    def gc(self, roots: Iterable[Path], dry_run: bool = False) -> int:
+        """
+        Delete blobs no session image under roots points to; return bytes freed.
+        A blob is live when some image shares its inode: stat() follows symlinks,
+        so this covers both link modes. Images that had to be copied keep their
+        own bytes and don't hold their blob alive. A symlinked tree's blobs are its
+        only copy, so every recorded symlink root has to be among roots.
+        """
+        scanned = {Path(r).resolve() for r in roots}
+        unscanned = [r for r, mode in self.roots.items()
+                     if mode == "symlink" and Path(r) not in scanned and Path(r).is_dir()]
+        if unscanned:
+            raise ValueError("Refusing to gc: these trees symlink into the store but weren't scanned: "
+                             + ", ".join(unscanned))
+        live = set()
+        for root in scanned:
+            for _, path in iter_session_images(root):
+                st = path.stat()
+                live.add((st.st_dev, st.st_ino))
+        freed = 0
+        for blob in self.iter_blobs():
+            st = blob.stat()
+            if (st.st_dev, st.st_ino) not in live:
+                freed += st.st_size
+                if not dry_run:
+                    blob.unlink()
+        return freed
+
+# --------------------------- Dedupe ------------------------------------------
+def disk_usage(paths: Iterable[Path]) -> int:
+    """Bytes used by paths, counting each hardlinked inode once and symlinks not at all."""
+    seen = set()
+    total = 0
+    for p in paths:
+        if p.is_symlink():
+            continue
+        st = p.stat()
+        if (st.st_dev, st.st_ino) not in seen:
+            seen.add((st.st_dev, st.st_ino))
+            total += st.st_size
+    return total
+
+def dedupe_trees(roots: List[Path], store: BlobStore, dry_run: bool = False) -> Dict[str, List[Path]]:
+    """
+    Replace every session image under roots with a link into store.
+    Returns the files grouped by sha256.
+    """
+    by_digest: Dict[str, List[Path]] = defaultdict(list)
+    for root in roots:
+        for _, path in iter_session_images(root):
+            by_digest[file_sha256(path)].append(path)
+
+    all_paths = [p for paths in by_digest.values() for p in paths]
+    before = disk_usage(all_paths)
+    if not dry_run:
+        for root in roots:
+            if Path(root).is_dir():
+                store.record_root(root)
+        for digest, paths in by_digest.items():
+            store.put_file(paths[0], digest)
+            for p in paths:
+                if not store.is_linked(p, digest):
+                    store.link(digest, p)
+    after = sum(paths[0].stat().st_size for paths in by_digest.values())
+
+    print(f"Files: {len(all_paths)}  unique: {len(by_digest)}")
+    print(f"Disk used by trees: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB"
+          f"{' (dry run)' if dry_run else ''}")
+    return by_digest
+
+# --------------------------- Near duplicates ---------------------------------
+def dhash(path: Path, size: int = 8) -> int:
+    """64-bit difference hash: compares neighbouring pixels of a tiny greyscale thumbnail."""
+    from PIL import Image  # only needed for near-duplicate reports
+
+    with Image.open(path) as im:
+        px = im.convert("L").resize((size + 1, size), Image.LANCZOS).tobytes()
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left, right = px[row * (size + 1) + col], px[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+def near_duplicates(by_digest: Dict[str, List[Path]],
+                    max_bits: int = NEAR_DUPLICATE_BITS) -> List[List[Path]]:
+    """Group distinct files whose perceptual hashes differ by at most max_bits."""
+    hashes = []
+    for digest, paths in by_digest.items():
+        try:
+            hashes.append((dhash(paths[0]), paths[0]))
+        except Exception as e:
+            print(f"[WARN] Can't hash {paths[0]}: {e}")
+
+    parent = list(range(len(hashes)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(hashes)):
+        for j in range(i + 1, len(hashes)):
+            if bin(hashes[i][0] ^ hashes[j][0]).count("1") <= max_bits:
+                parent[find(i)] = find(j)
+
+    groups: Dict[int, List[Path]] = defaultdict(list)
+    for i, (_, path) in enumerate(hashes):
+        groups[find(i)].append(path)
+    return [sorted(g) for g in groups.values() if len(g) > 1]
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Content-addressed store for session images.")
+    parser.add_argument("--store", type=str, default=str(IMAGE_STORE_DIR), help="Blob store directory.")
+    parser.add_argument("--link-mode", type=str, default="hardlink", choices=LINK_MODES,
+                        help="How session paths point into the store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    dedupe = sub.add_parser("dedupe", help="Move existing session trees into the store and link them.")
+    dedupe.add_argument("roots", nargs="*", default=[str(r) for r in DEFAULT_ROOTS],
+                        help="Roots holding session{N}/ folders.")
+    dedupe.add_argument("--dry-run", action="store_true", help="Only report what would be saved.")
+    dedupe.add_argument("--near", type=int, default=NEAR_DUPLICATE_BITS,
+                        help="Report near-duplicates within this many dHash bits (-1 to skip).")
+
+    gc = sub.add_parser("gc", help="Delete blobs no session path under the roots links to.")
+    gc.add_argument("roots", nargs="*", default=[str(r) for r in DEFAULT_ROOTS],
+                    help=f"Every root whose session{{N}}/ folders link into the store (see {ROOTS_FILE}).")
+    gc.add_argument("--dry-run", action="store_true", help="Only report what would be freed.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    store = BlobStore(Path(args.store), args.link_mode)
+
+    if args.command == "gc":
+        try:
+            freed = store.gc([Path(r) for r in args.roots], dry_run=args.dry_run)
+        except ValueError as e:
+            raise SystemExit(str(e)) from e
+        print(f"{'Would free' if args.dry_run else 'Freed'} {freed / 1e6:.1f} MB.")
+        return
+
+    by_digest = dedupe_trees([Path(r) for r in args.roots], store, dry_run=args.dry_run)
+    for paths in by_digest.values():
+        if len(paths) > 1:
+            print("Identical: " + ", ".join(str(p) for p in paths))
+    if args.near >= 0:
+        for group in near_duplicates(by_digest, args.near):
+            print("Near-duplicate: " + ", ".join(str(p) for p in group))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from image_manifest import IMAGE_MANIFEST
+from session_assets import (
+    SITE_SESSIONS_DIR, SITE_SESSIONS_MD, load_json, parse_sessions_markdown, session_of,
+)
+
+# --------------------------- Defaults ----------------------------------------
+SHARDS_DIR: Path = Path(__file__).resolve().parent.parent / "public" / "data" / "sessions"
+SHARD_SIZE: int = 6                    # sessions per shard; matches SessionsList's page size
+SHARD_INDEX: str = "index.json"
+SHARD_FILE_RE = re.compile(r"^page-\d+\.[0-9a-f]+\.json$")
+IMAGE_FIELDS = ("width", "height", "color", "placeholder")  # what a tile needs before its image loads
+
+# --------------------------- Shards ------------------------------------------
+def stable_json(payload) -> bytes:
+    """Canonical bytes: sorted keys, no whitespace, UTF-8, trailing newline."""
+    return (json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+def images_by_session(manifest: dict) -> Dict[int, List[dict]]:
+    """Image manifest entries grouped by session, in SessionsList's path order."""
+    grouped: Dict[int, List[dict]] = defaultdict(list)
+    for rel in sorted(manifest.get("images", {})):
+        num = session_of(rel)
+        if num is not None:
+            entry = manifest["images"][rel]
+            grouped[num].append({"file": rel, **{k: entry[k] for k in IMAGE_FIELDS if k in entry}})
+    return grouped
+
+def shard_sessions(sessions: List[dict], size: int = SHARD_SIZE) -> Dict[int, List[dict]]:
+    """
+    Bucket sessions by position counted from the oldest, newest first within each
+    shard: shard k holds the (k*size+1)th .. ((k+1)*size)th sessions, except that
+    the newest shard also takes the remainder, so it holds size .. 2*size-1 and
+    first paint needs only that one. Adding a session only rewrites the newest
+    shard (splitting it in two once it reaches 2*size); older shards keep their
+    bytes and their cache entries however the numbers are spaced.
+    """
+    newest = max(0, len(sessions) // size - 1)
+    shards: Dict[int, List[dict]] = defaultdict(list)
+    for i, s in enumerate(sorted(sessions, key=lambda s: s["number"])):
+        shards[min(i // size, newest)].insert(0, s)
+    return shards
+
+def build_shards(markdown: Path = SITE_SESSIONS_MD,
+                 images_root: Path = SITE_SESSIONS_DIR,
+                 out_dir: Path = SHARDS_DIR,
+                 size: int = SHARD_SIZE) -> Dict[str, int]:
+    """
+    Parse sessions.md once and write out_dir/page-{k}.{hash}.json shards, newest
+    first, plus out_dir/index.json listing them. Each session carries its entries
+    from the image manifest. Names include a content hash, so shards can be cached
+    forever; files are only rewritten when their bytes change, and shards no longer
+    in the index are deleted.
+    """
+    out_dir = Path(out_dir)
+    sessions = parse_sessions_markdown(Path(markdown).read_text(encoding="utf-8"))
+    manifest = load_json(Path(images_root) / IMAGE_MANIFEST, None)
+    if manifest is None:
+        print(f"[WARN] No {IMAGE_MANIFEST} under {images_root}; run image_manifest.py first. "
+              f"Shards will list no images.")
+    images = images_by_session(manifest or {})
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pages, written = [], 0
+    for k, members in sorted(shard_sessions(sessions, size).items(), reverse=True):
+        body = stable_json({
+            "version": 1,
+            "sessions": [dict(s, images=images.get(s["number"], [])) for s in members],
+        })
+        name = f"page-{k}.{hashlib.sha256(body).hexdigest()[:12]}.json"
+        written += _write_if_changed(out_dir / name, body)
+        pages.append({"file": name, "sessions": [s["number"] for s in members]})
+
+    written += _write_if_changed(out_dir / SHARD_INDEX, stable_json({
+        "version": 1,
+        "shard_size": size,
+        "total": len(sessions),
+        "pages": pages,
+    }))
+    keep = {p["file"] for p in pages}
+    removed = 0
+    for path in out_dir.iterdir():
+        if SHARD_FILE_RE.match(path.name) and path.name not in keep:
+            path.unlink()
+            removed += 1
+    return {"sessions": len(sessions), "shards": len(pages), "written": written, "removed": removed}
+
+def _write_if_changed(path: Path, body: bytes) -> int:
+    try:
+        if path.read_bytes() == body:
+            return 0
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(body)
+    tmp.replace(path)
+    return 1
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Split sessions.md into cacheable JSON shards for paginated loading.")
+    parser.add_argument("--markdown", type=str, default=str(SITE_SESSIONS_MD), help="Session write-ups.")
+    parser.add_argument("-i", "--input", type=str, default=str(SITE_SESSIONS_DIR),
+                        help=f"Root holding session{{N}}/ folders and {IMAGE_MANIFEST}.")
+    parser.add_argument("-o", "--output", type=str, default=str(SHARDS_DIR), help="Where shards and index.json go.")
+    parser.add_argument("--size", type=int, default=SHARD_SIZE, help="Sessions per shard.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    stats = build_shards(Path(args.markdown), Path(args.input), Path(args.output), args.size)
+    print(f"{stats['sessions']} sessions in {stats['shards']} shards; "
+          f"{stats['written']} files written, {stats['removed']} stale shards removed.")
+
+if __name__ == "__main__":
+    main()
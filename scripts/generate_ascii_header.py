@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 """
 ASCII Art Generator for "DEMOS"
-Creates monospace ASCII art similar to the Jules style
+Creates monospace ASCII art similar to the Jules style,
+renders banners from FIGlet fonts,
+and precomputes the header's ghost/chaser animation for playback
 """
 
+import argparse
+import functools
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+
 def create_demos_ascii():
     """
     Creates ASCII art for 'DEMOS' using block characters
@@ -144,20 +154,493 @@ def create_demos_ascii_jules_style():
 
 	return ascii_lines
 
-def print_ascii_for_javascript(ascii_lines, title="DEMOS ASCII Art"):
+def print_ascii_for_javascript(ascii_lines, title="DEMOS ASCII Art", name="demosLogoText", pad=60):
     """
     Format the ASCII art for JavaScript array
     """
     print(f"\n// {title}")
-    print("const demosLogoText = [")
+    print(f"const {name} = [")
     for line in ascii_lines:
         # Pad to 60 characters to match Jules format
-        padded_line = line.ljust(60)
-        print(f'    "{padded_line}",')
+        padded_line = line.ljust(pad)
+        print(f"    {json.dumps(padded_line, ensure_ascii=False)},")
     print("];")
     print()
 
+# Header animation: same rules and constants as src/components/ASCIIHeader.jsx
+HEADER_ASCII = [
+    'MM"""Yb.                                             ',
+    'MM    `Yb.                                           ',
+    'MM     `Mb  .gP"Ya   MMpMMMb.pMMMb.  ,pW"Wq.  ,pP"Yb.',
+    'MM      MM ,M\'   Yb  MM    MM    MM 6W\'   `Wb 8I   `"',
+    'MM     ,MP 8M""""""  MM    MM    MM 8M     M8 `YMMMa.',
+    'MM    ,dP\' YM.       MM    MM    MM YA.   ,A9 .    I8',
+    'MMmmmdP\'    `Mbmmd\'  MM    MM    MM  `Ybmd9\'  M9mmmP\''
+]
+GRID_WIDTH = 80
+GRID_HEIGHT = 10
+TICK_RATE = 200               # ms per ghost move at speed 1
+FRAME_MS = 50                 # the component's update interval; one frame per update
+TYPE1_SPAWN_CHANCE = 0.04
+MAX_TYPE1_CHARS = 20
+INITIAL_SPAWN_COUNT = 12
+INITIAL_SPAWN_DURATION = 2000
+INITIAL_SPAWN_CHANCE = 0.20
+TYPE2_CHAR = '@'
+GHOST_COLORS = ['#778BEB', '#FFB347', '#9370DB', '#000000']
+CHASER_COLOR = '#FF5E5B'
+CHASER_STYLE = len(GHOST_COLORS)  # style index of the chaser in the palette
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+def header_start_x(width=GRID_WIDTH, padding=2):
+    """Column where ASCIIHeader.jsx places the logo when all GRID_WIDTH columns are visible"""
+    ascii_width = max(len(line.rstrip()) for line in HEADER_ASCII)
+    x = max(padding, min((width - ascii_width) // 2, GRID_WIDTH - ascii_width - padding))
+    return max(0, min(x, GRID_WIDTH - ascii_width))
+
+def header_letter_positions(start_x):
+    """(x, y, char) for every letter of the logo; ghosts spawn from these"""
+    start_y = (GRID_HEIGHT - len(HEADER_ASCII)) // 2
+    positions = []
+    for y, line in enumerate(HEADER_ASCII):
+        for x, ch in enumerate(line.rstrip()):
+            if ch.isascii() and ch.isalpha() and 0 <= start_x + x < GRID_WIDTH:
+                positions.append((start_x + x, start_y + y, ch))
+    return positions
+
+def simulate_header(frames, seed=0, start_x=None):
+    """
+    Run the header's ghost/chaser simulation for `frames` updates of FRAME_MS each,
+    deterministically for a given seed. Follows ASCIIHeader.jsx update for update:
+    ghosts move every TICK_RATE / speed ms and slow down, the chaser steps every
+    TICK_RATE / 2 ms towards the nearest ghost (as it was before this update), and
+    eats ghosts that land on its previous cell.
+    Returns one sprite layer per frame: {(x, y): (char, style)}.
+    """
+    rng = random.Random(seed)
+    start_x = header_start_x() if start_x is None else start_x
+    letters = header_letter_positions(start_x)
+
+    def perpendicular(vx, vy):
+        sign = 1 if rng.random() > 0.5 else -1
+        return (0, sign) if vx != 0 else (sign, 0)
+
+    def spawn(ghosts, now):
+        if len(ghosts) >= MAX_TYPE1_CHARS or not letters:
+            return
+        x, y, ch = letters[int(rng.random() * len(letters))]
+        vx, vy = DIRECTIONS[int(rng.random() * len(DIRECTIONS))]
+        ghosts.append({
+            "x": x, "y": y, "char": ch,
+            "style": int(rng.random() * len(GHOST_COLORS)),
+            "vx": vx, "vy": vy, "speed": 1 + rng.random() * 0.5,
+            "decay": 0.95 + rng.random() * 0.04,
+            "last_move": now, "moves": 0,
+            "moves_before_turn": 2 + int(rng.random() * 3),
+        })
+
+    def move_ghost(g, now):
+        if not g["speed"] or now - g["last_move"] < TICK_RATE / g["speed"]:
+            return g  # stopped, or not due to move yet
+        speed = g["speed"] * g["decay"]
+        if speed < 0.1:
+            return {**g, "vx": 0, "vy": 0, "speed": 0}
+        vx, vy = g["vx"], g["vy"]
+        moves, before = g["moves"] + 1, g["moves_before_turn"]
+        if moves >= before:
+            vx, vy = perpendicular(g["vx"], g["vy"])
+            moves, before = 0, 2 + int(rng.random() * 3)
+        x, y = g["x"] + vx, g["y"] + vy
+        if not 0 <= x < GRID_WIDTH:
+            x = max(0, min(GRID_WIDTH - 1, x))
+            vx, vy = perpendicular(-vx, vy)
+            moves = 0
+        if not 0 <= y < GRID_HEIGHT:
+            y = max(0, min(GRID_HEIGHT - 1, y))
+            vx, vy = perpendicular(vx, -vy)
+            moves = 0
+        return {**g, "x": x, "y": y, "vx": vx, "vy": vy, "speed": speed, "last_move": now,
+                "moves": moves, "moves_before_turn": before}
+
+    def move_chaser(c, ghosts, now):
+        if now - c["last_move"] < TICK_RATE * 0.5:
+            return c
+        target, best = None, float("inf")
+        for g in ghosts:
+            d = abs(g["x"] - c["x"]) + abs(g["y"] - c["y"])
+            if d < best:
+                best, target = d, g
+        vx, vy = c["vx"], c["vy"]
+        if target:
+            dx, dy = target["x"] - c["x"], target["y"] - c["y"]
+            if abs(dx) > abs(dy):
+                vx, vy = (dx > 0) - (dx < 0), 0
+            elif dy != 0:
+                vx, vy = 0, (dy > 0) - (dy < 0)
+        elif rng.random() > 0.8:
+            vx, vy = DIRECTIONS[int(rng.random() * len(DIRECTIONS))]
+        return {**c, "x": max(0, min(GRID_WIDTH - 1, c["x"] + vx)),
+                "y": max(0, min(GRID_HEIGHT - 1, c["y"] + vy)), "vx": vx, "vy": vy, "last_move": now}
+
+    chaser = {"x": int(rng.random() * GRID_WIDTH), "y": int(rng.random() * GRID_HEIGHT),
+              "vx": 1 if rng.random() > 0.5 else -1, "vy": 0, "last_move": 0}
+    ghosts = []
+    layers = []
+    for frame in range(frames):
+        now = frame * FRAME_MS
+        if frame < INITIAL_SPAWN_COUNT:  # the startup burst: one spawn every 50 ms
+            spawn(ghosts, now)
+        moved = [move_ghost(g, now) for g in ghosts]
+        new_chaser = move_chaser(chaser, ghosts, now)
+        moved = [g for g in moved if (g["x"], g["y"]) != (chaser["x"], chaser["y"])]
+        chance = INITIAL_SPAWN_CHANCE if now < INITIAL_SPAWN_DURATION else TYPE1_SPAWN_CHANCE
+        if not ghosts or rng.random() < chance:
+            spawn(moved, now)
+        ghosts, chaser = moved, new_chaser
+
+        layer = {(g["x"], g["y"]): (g["char"], g["style"]) for g in ghosts}
+        layer[(chaser["x"], chaser["y"])] = (TYPE2_CHAR, CHASER_STYLE)
+        layers.append(layer)
+    return layers
+
+def encode_delta(before, after):
+    """
+    Cell updates turning sprite layer `before` into `after`, as 4-char ops:
+    2 base-36 digits of the cell index (y * GRID_WIDTH + x), the glyph, and the
+    style index ('-' clears the cell back to the logo/background).
+    """
+    ops = []
+    for x, y in sorted(set(before) | set(after), key=lambda p: (p[1], p[0])):
+        cell = after.get((x, y))
+        if cell == before.get((x, y)):
+            continue
+        idx = y * GRID_WIDTH + x
+        glyph, style = cell if cell else (" ", "-")
+        ops.append(f"{BASE36[idx // 36]}{BASE36[idx % 36]}{glyph}{style}")
+    return "".join(ops)
+
+def encode_animation(layers, seed=0, start_x=None):
+    """
+    Delta-encode a simulation for playback: frames is a list of [hold, ops], where
+    ops are applied and then held for `hold` frames (runs of unchanged frames are
+    merged). loop holds the ops that take the last frame back to the first.
+    """
+    frames = []
+    previous = {}
+    for layer in layers:
+        ops = encode_delta(previous, layer)
+        if frames and not ops:
+            frames[-1][0] += 1
+        else:
+            frames.append([1, ops])
+        previous = layer
+    return {
+        "version": 1,
+        "seed": seed,
+        "frame_ms": FRAME_MS,
+        "width": GRID_WIDTH,
+        "height": GRID_HEIGHT,
+        "start_x": header_start_x() if start_x is None else start_x,
+        "palette": GHOST_COLORS + [CHASER_COLOR],
+        "frames": frames,
+        "loop": encode_delta(layers[-1], layers[0]) if layers else "",
+    }
+
+def animation_stats(animation):
+    """Frame counts and encoded size versus sending every full frame as text"""
+    total = sum(hold for hold, _ in animation["frames"])
+    encoded = len(json.dumps(animation, separators=(",", ":")).encode("utf-8"))
+    raw = total * animation["width"] * animation["height"]
+    return {
+        "frames": total,
+        "keyframes": len(animation["frames"]),
+        "cell_updates": sum(len(ops) // 4 for _, ops in animation["frames"]),
+        "encoded_bytes": encoded,
+        "raw_bytes": raw,
+        "ratio": raw / encoded if encoded else None,
+    }
+
+# FIGlet banner engine: renders any text from FIGlet (.flf) fonts
+FIGLET_FONT_DIRS = [
+    Path(__file__).resolve().parent.parent / "node_modules" / "figlet" / "fonts",  # the site's figlet package
+    Path("/usr/share/figlet"),
+    Path("/usr/local/share/figlet"),
+]
+FULL_WIDTH, KERNING, SMUSHING = "full", "kern", "smush"
+SMUSH_EQUAL, SMUSH_LOWLINE, SMUSH_HIERARCHY, SMUSH_PAIR, SMUSH_BIGX, SMUSH_HARDBLANK = 1, 2, 4, 8, 16, 32
+HIERARCHY_CLASSES = ["|", "/\\", "[]", "{}", "()", "<>"]
+FILL_SETS = {
+    "font": "",         # keep the font's own characters
+    "block": "\u2588",
+    "shade": "\u2591\u2592\u2593\u2588",
+    "hash": "#",
+    "jules": "XMK0Wc",
+}
+BANNER_WIDTHS = (80, 60, 40)
+
+class FigletFont:
+    """A parsed .flf font: every glyph as a (height, width) NumPy character array"""
+
+    def __init__(self, name, height, hardblank, layout, rules, glyphs, right_to_left=False):
+        self.name = name
+        self.height = height
+        self.hardblank = hardblank
+        self.layout = layout    # FULL_WIDTH, KERNING or SMUSHING
+        self.rules = rules      # SMUSH_* bits; 0 with SMUSHING means universal smushing
+        self.glyphs = glyphs
+        self.right_to_left = right_to_left
+
+def parse_figlet_font(text, name="font"):
+    """Parse FIGlet font text (flf2a header, comments, then glyphs for ASCII 32-126 and code-tagged extras)"""
+    lines = text.splitlines()
+    header = lines[0].split()
+    if not header or not header[0].startswith("flf2a"):
+        raise ValueError(f"{name} is not a FIGlet font")
+    hardblank = header[0][5]
+    height, comment_lines = int(header[1]), int(header[5])
+    old_layout = int(header[4])
+    right_to_left = len(header) > 6 and header[6] == "1"
+    full_layout = int(header[7]) if len(header) > 7 else None
+    if full_layout is None:  # derive the modern layout bits from the old field, as figlet does
+        full_layout = 0 if old_layout < 0 else (64 if old_layout == 0 else 128 | (old_layout & 31))
+    layout = SMUSHING if full_layout & 128 else KERNING if full_layout & 64 else FULL_WIDTH
+    rules = full_layout & 63
+
+    def read_glyph(start):
+        rows = lines[start:start + height]
+        if len(rows) < height:
+            return None
+        end = rows[-1].rstrip()[-1:] if rows[-1].strip() else ""
+        rows = [r.rstrip().rstrip(end) if end else r.rstrip() for r in rows]
+        width = max(len(r) for r in rows)
+        return np.array([list(r.ljust(width)) for r in rows], dtype="<U1").reshape(height, width)
+
+    glyphs = {}
+    pos = 1 + comment_lines
+    for code in list(range(32, 127)) + [196, 214, 220, 228, 246, 252, 223]:
+        glyph = read_glyph(pos)
+        if glyph is None:
+            break
+        glyphs[chr(code)] = glyph
+        pos += height
+    while pos < len(lines):  # code-tagged characters: "<code> [comment]" then the glyph
+        tag = lines[pos].split()
+        pos += 1
+        if not tag:
+            continue
+        try:
+            code = int(tag[0], 0)
+        except ValueError:
+            break
+        glyph = read_glyph(pos)
+        if glyph is None:
+            break
+        if code >= 0:
+            glyphs[chr(code)] = glyph
+        pos += height
+    return FigletFont(name, height, hardblank, layout, rules, glyphs, right_to_left)
+
+def find_font(name):
+    path = Path(name)
+    if path.suffix == ".flf" and path.is_file():
+        return path
+    for d in FIGLET_FONT_DIRS:
+        for candidate in (d / f"{name}.flf", d / name):
+            if candidate.is_file():
+                return candidate
+    raise FileNotFoundError(f"FIGlet font {name!r} not found in {', '.join(str(d) for d in FIGLET_FONT_DIRS)}")
+
+@functools.lru_cache(maxsize=None)
+def load_font(name):
+    """Load and parse a font once per process; later calls reuse the parsed glyphs"""
+    path = find_font(name)
+    data = path.read_bytes()
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")
+    return parse_figlet_font(text, path.stem)
+
+def smush_chars(left, right, font, layout, rules):
+    """The character two touching cells merge into, or None if they can't (figlet's smushem)"""
+    if left == " ":
+        return right
+    if right == " ":
+        return left
+    if layout != SMUSHING:
+        return None
+    hb = font.hardblank
+    if rules == 0:  # universal smushing: the later glyph wins, hardblanks give way
+        return right if left == hb else left if right == hb else right
+    if rules & SMUSH_HARDBLANK and left == hb and right == hb:
+        return left
+    if left == hb or right == hb:
+        return None
+    if rules & SMUSH_EQUAL and left == right:
+        return left
+    if rules & SMUSH_LOWLINE:
+        if left == "_" and right in "|/\\[]{}()<>":
+            return right
+        if right == "_" and left in "|/\\[]{}()<>":
+            return left
+    if rules & SMUSH_HIERARCHY:
+        lc = next((i for i, c in enumerate(HIERARCHY_CLASSES) if left in c), None)
+        rc = next((i for i, c in enumerate(HIERARCHY_CLASSES) if right in c), None)
+        if lc is not None and rc is not None and lc != rc:
+            return right if rc > lc else left
+    if rules & SMUSH_PAIR and left + right in ("[]", "][", "{}", "}{", "()", ")("):
+        return "|"
+    if rules & SMUSH_BIGX:
+        big_x = {"/\\": "|", "\\/": "Y", "><": "X"}
+        if left + right in big_x:
+            return big_x[left + right]
+    return None
+
+def _edge_blanks(grid, from_right):
+    """Blank cells at the right (or left) edge of each row; a blank row counts its full width"""
+    ink = grid != " "
+    if from_right:
+        ink = ink[:, ::-1]
+    return np.where(ink.any(axis=1), ink.argmax(axis=1), grid.shape[1])
+
+def compose_banner(text, font, layout=None, spacing=0):
+    """
+    Lay text out on one (height, width) character array, fitting each glyph
+    against the banner so far per the font's layout (or the one given):
+    full width, kerning (touching) or smushing (overlapping by one merged column).
+    """
+    layout = layout or font.layout
+    rules = font.rules
+    out = np.full((font.height, 0), " ", dtype="<U1")
+    prev_width = 0
+    for ch in (reversed(text) if font.right_to_left else text):
+        glyph = font.glyphs.get(ch)
+        if glyph is None:
+            continue
+        width = glyph.shape[1]
+        amount = 0
+        if layout != FULL_WIDTH and not out.shape[1]:
+            amount = int(_edge_blanks(glyph, from_right=False).min()) if width else 0  # trim shared left margin
+        elif layout != FULL_WIDTH and width:
+            trail = _edge_blanks(out, from_right=True)
+            lead = _edge_blanks(glyph, from_right=False)
+            amounts = trail + lead
+            if layout == SMUSHING and prev_width > 1 and width > 1:
+                rows = np.arange(font.height)
+                left = out[rows, np.clip(out.shape[1] - 1 - trail, 0, None)]
+                right = glyph[rows, np.clip(lead, 0, width - 1)]
+                for r in rows:
+                    if trail[r] < out.shape[1] and lead[r] < width and \
+                            smush_chars(left[r], right[r], font, layout, rules):
+                        amounts[r] += 1
+            amount = int(min(amounts.min(), width, out.shape[1]))
+        if spacing and out.shape[1]:
+            out = np.hstack([out, np.full((font.height, spacing), " ", dtype="<U1")])
+            amount = 0
+        if amount and not out.shape[1]:
+            out = glyph[:, amount:]
+        elif amount:
+            overlap = out[:, -amount:].copy()
+            incoming = glyph[:, :amount]
+            merged = np.where(overlap == " ", incoming, overlap)
+            both = (overlap != " ") & (incoming != " ")
+            for r, c in zip(*np.nonzero(both)):
+                merged[r, c] = smush_chars(overlap[r, c], incoming[r, c], font, layout, rules) or incoming[r, c]
+            out = np.hstack([out[:, :-amount], merged, glyph[:, amount:]])
+        else:
+            out = np.hstack([out, glyph])
+        prev_width = width
+    return out
+
+def apply_fill(grid, fill, hardblank):
+    """Swap every inked cell for a character from the fill set (hardblanks become spaces)"""
+    grid = np.where(grid == hardblank, " ", grid)
+    if not fill:
+        return grid
+    chars, inverse = np.unique(grid, return_inverse=True)
+    lookup = np.array([c if c == " " else fill[ord(c) % len(fill)] for c in chars], dtype="<U1")
+    return lookup[inverse.reshape(grid.shape)]
+
+def banner_lines(grid):
+    return ["".join(row).rstrip() for row in grid]
+
+def wrap_banner(text, font, width, layout=None, fill=""):
+    """Render text as banner lines no wider than width, breaking between words (or inside a word that can't fit)"""
+    fits = lambda s: compose_banner(s, font, layout).shape[1] <= width
+    pieces = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if fits(candidate):
+            line = candidate
+            continue
+        if line:
+            pieces.append(line)
+        line = ""
+        for ch in word:  # a word wider than the banner is broken wherever it overflows
+            if line and not fits(line + ch):
+                pieces.append(line)
+                line = ""
+            line += ch
+    if line:
+        pieces.append(line)
+    lines = []
+    for piece in pieces:
+        lines += banner_lines(apply_fill(compose_banner(piece, font, layout), fill, font.hardblank))
+    return lines
+
+def render_banners(texts, font="standard", widths=BANNER_WIDTHS, layout=None, fill="font"):
+    """Render every text at every breakpoint width: {(text, width): lines}"""
+    figlet_font = load_font(font) if isinstance(font, str) else font
+    fill_chars = FILL_SETS.get(fill, fill)
+    return {(text, width): wrap_banner(text, figlet_font, width, layout, fill_chars)
+            for text in texts for width in widths}
+
+def print_banners_for_javascript(banners):
+    for (text, width), lines in banners.items():
+        slug = "".join(c for c in text.title() if c.isalnum()) or "Banner"
+        name = f"banner{slug}W{width}"
+        print_ascii_for_javascript(lines, f"{text} - {width} columns", name=name, pad=max(map(len, lines), default=0))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Print the DEMOS logo styles, or precompute the header animation.")
+    parser.add_argument("--animation", type=str, default="",
+                        help="Write the precomputed header animation (JSON) to this path.")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of the animation loop.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same frames.")
+    parser.add_argument("--banner", type=str, nargs="+", default=[],
+                        help="Render these strings from a FIGlet font as JavaScript arrays.")
+    parser.add_argument("--font", type=str, default="standard", help="FIGlet font name or path to an .flf file.")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(BANNER_WIDTHS),
+                        help="Breakpoint widths (columns) to wrap each banner to.")
+    parser.add_argument("--layout", type=str, default=None, choices=[FULL_WIDTH, KERNING, SMUSHING],
+                        help="Override the font's horizontal layout.")
+    parser.add_argument("--fill", type=str, default="font",
+                        help=f"Fill set ({', '.join(FILL_SETS)}) or literal characters to draw with.")
+    return parser.parse_args()
+
+def write_header_animation(path, seconds, seed):
+    layers = simulate_header(int(seconds * 1000 / FRAME_MS), seed)
+    animation = encode_animation(layers, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(animation, f, separators=(",", ":"))
+        f.write("\n")
+    stats = animation_stats(animation)
+    print(f"Wrote {path}: {stats['frames']} frames ({stats['keyframes']} with changes), "
+          f"{stats['cell_updates']} cell updates, {stats['encoded_bytes']} bytes "
+          f"({stats['ratio']:.0f}x smaller than full frames)")
+    return stats
+
 def main():
+    args = parse_args()
+    if args.animation:
+        write_header_animation(args.animation, args.seconds, args.seed)
+        return
+    if args.banner:
+        print_banners_for_javascript(render_banners(args.banner, args.font, args.widths, args.layout, args.fill))
+        return
+
     print("ASCII Art Generator for DEMOS")
     print("=" * 40)
     
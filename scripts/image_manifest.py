@@ -0,0 +1,93 @@
+import argparse
+import base64
+import io
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from PIL import Image, ImageFilter, ImageOps, features
+
+from session_assets import add_build_args, update_image_manifest
+
+# --------------------------- Defaults ----------------------------------------
+IMAGE_MANIFEST: str = "image-manifest.json"   # at the root of the sessions tree
+PLACEHOLDER_SIZE: int = 16                    # longest side of the blurred placeholder, px
+PLACEHOLDER_BLUR: float = 1.0                 # Gaussian radius applied to the placeholder
+PLACEHOLDER_QUALITY: int = 40
+PALETTE_COLORS: int = 5                       # colours considered when picking the dominant one
+
+# --------------------------- Helpers -----------------------------------------
+def placeholder_format() -> str:
+    return "webp" if features.check("webp") else "png"
+
+def dominant_color(im: Image.Image) -> str:
+    """Most common colour of a small palette-reduced copy, as #rrggbb."""
+    small = im.convert("RGB")
+    small.thumbnail((64, 64))
+    quantized = small.quantize(colors=PALETTE_COLORS)
+    palette = quantized.getpalette()
+    _, index = max(quantized.getcolors())
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def placeholder_data_uri(im: Image.Image, size: int, fmt: str) -> str:
+    """A tiny blurred copy of the image, inlined as a data: URI."""
+    thumb = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+    thumb.thumbnail((size, size), Image.LANCZOS)
+    thumb = thumb.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR))
+    buf = io.BytesIO()
+    if fmt == "webp":
+        thumb.save(buf, format="WEBP", quality=PLACEHOLDER_QUALITY)
+    else:
+        thumb.save(buf, format="PNG", optimize=True)
+    return f"data:image/{fmt};base64,{base64.b64encode(buf.getvalue()).decode('ascii')}"
+
+def describe_image(root: str, rel: str, size: int, fmt: str) -> dict:
+    """
+    Layout metadata for one image. Runs in a worker process. Width/height are
+    after EXIF orientation, i.e. as the browser will display the image.
+    """
+    path = Path(root) / rel
+    with Image.open(path) as opened:
+        im = ImageOps.exif_transpose(opened)  # first frame for animated images
+        width, height = im.size
+        return {
+            "width": width,
+            "height": height,
+            "bytes": path.stat().st_size,
+            "color": dominant_color(im),
+            "placeholder": placeholder_data_uri(im, size, fmt),
+        }
+
+# --------------------------- Manifest ----------------------------------------
+def build_manifest(root: Path,
+                   size: int = PLACEHOLDER_SIZE,
+                   workers: Optional[int] = None,
+                   force: bool = False,
+                   sessions: Optional[Sequence[int]] = None) -> Dict[str, int]:
+    """
+    Describe every session image under root in root/image-manifest.json, keyed by
+    path relative to root. Images whose sha256 matches their entry are skipped.
+    """
+    fmt = placeholder_format()
+    return update_image_manifest(
+        root, IMAGE_MANIFEST, {"placeholder_size": size, "placeholder_format": fmt},
+        describe_image, (size, fmt), workers=workers, force=force, sessions=sessions,
+    )
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Write image-manifest.json with dimensions, dominant colour and a blurred placeholder per session image."
+    )
+    add_build_args(parser)
+    parser.add_argument("--size", type=int, default=PLACEHOLDER_SIZE, help="Placeholder longest side in px.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    stats = build_manifest(Path(args.input), args.size, args.workers, args.force)
+    print(f"Described {stats['processed']} images, skipped {stats['skipped']} unchanged, "
+          f"removed {stats['removed']} stale, {stats['failed']} failed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Threaded HTTP server on 127.0.0.1 for the offline stand-ins the scripts test
+against (benchmark_scraper's image host, notion_stub_server's Notion site).
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Keep-alive request handler that doesn't log every request. self.owner is the LocalServer."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive clients
+    # wait out a delayed ACK (~40 ms) before every small body arrives.
+    disable_nagle_algorithm = True
+
+    @property
+    def owner(self) -> "LocalServer":
+        return self.server.owner
+
+    def send_body(self, status: int, body: bytes = b"", content_type: str = "",
+                  headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class LocalServer:
+    """
+    Serves `handler` (a QuietHandler subclass) from a background thread for the
+    duration of a with-block. port 0 picks a free port; see base_url.
+    """
+
+    handler = QuietHandler
+
+    def __init__(self, port: int = 0):
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), self.handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,177 @@
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from local_server import LocalServer, QuietHandler
+from scrape_images_from_notion import NOTION_API_PATH, request_key
+
+# --------------------------- Defaults ----------------------------------------
+STUB_PAGE_ID: str = "d3138e1a-280e-4042-be80-8cf0a926c919"
+STUB_SPACE_ID: str = "00000000-0000-4000-8000-000000000000"
+PLACEHOLDER_PNG: bytes = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+# --------------------------- Recordings --------------------------------------
+def load_recordings(record_dir: Path) -> Tuple[Dict[Tuple[str, int], dict], Dict[str, dict]]:
+    """
+    Read NotionHttpScraper --record output. Page chunks are keyed by (pageId, chunkNumber);
+    every block seen in any response goes into one pool that answers syncRecordValues.
+    """
+    chunks: Dict[Tuple[str, int], dict] = {}
+    blocks: Dict[str, dict] = {}
+    for path in sorted(Path(record_dir).glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            exchange = json.load(f)
+        request, response = exchange["request"], exchange["response"]
+        if exchange["endpoint"] == "loadPageChunk":
+            chunks[(request["pageId"], request.get("chunkNumber", 0))] = response
+        blocks.update((response.get("recordMap") or {}).get("block") or {})
+    return chunks, blocks
+
+def _block(block_id: str, block_type: str, parent: str, title: str = "",
+           content=None, source: str = "") -> dict:
+    value = {"id": block_id, "type": block_type, "parent_id": parent,
+             "space_id": STUB_SPACE_ID, "alive": True}
+    if title:
+        value["properties"] = {"title": [[title]]}
+    if source:
+        value.setdefault("properties", {})["source"] = [[source]]
+    if content:
+        value["content"] = content
+    return {"role": "reader", "value": value}
+
+def write_synthetic_recording(record_dir: Path, sessions: int = 5, images_per_session: int = 3,
+                              subpages_per_session: int = 0) -> str:
+    """
+    Write a recording shaped like a real Demos Anon page: one toggle per session whose
+    image children only arrive via syncRecordValues, as with collapsed toggles.
+    subpages_per_session adds that many linked sub-pages under each toggle, each with
+    images_per_session images of its own, for --crawl-depth.
+    Returns the page URL to scrape against the stub.
+    """
+    record_dir = Path(record_dir)
+    record_dir.mkdir(parents=True, exist_ok=True)
+    chunk_blocks, child_blocks = {}, {}
+    subpage_chunks = {}
+    toggles = []
+
+    def images_under(parent: str, n: int, tag: int) -> list:
+        ids = [f"{n:08x}-{i:04x}-4000-8000-{tag:012x}" for i in range(1, images_per_session + 1)]
+        for i, image_id in enumerate(ids, start=1):
+            child_blocks[image_id] = _block(
+                image_id, "image", parent,
+                source=f"https://prod-files-secure.s3.us-west-2.amazonaws.com/stub/session{n}/{tag}/image{i}.png",
+            )
+        return ids
+
+    for n in range(sessions, 0, -1):
+        toggle_id = f"{n:08x}-0000-4000-8000-000000000000"
+        content = images_under(toggle_id, n, 1)
+        for k in range(1, subpages_per_session + 1):
+            page_id = f"{n:08x}-{k:04x}-4000-9000-000000000000"
+            page_images = images_under(page_id, n, k + 1)
+            page = _block(page_id, "page", toggle_id, f"Session {n} photos {k}", content=page_images)
+            child_blocks[page_id] = page
+            subpage_chunks[page_id] = {page_id: page, **{i: child_blocks[i] for i in page_images}}
+            content.append(page_id)
+        toggles.append(toggle_id)
+        chunk_blocks[toggle_id] = _block(toggle_id, "toggle", STUB_PAGE_ID, f"Session {n}", content=content)
+    chunk_blocks[STUB_PAGE_ID] = _block(STUB_PAGE_ID, "page", STUB_SPACE_ID, "Demos Anon", content=toggles)
+
+    exchanges = [
+        ("loadPageChunk", {"pageId": STUB_PAGE_ID, "chunkNumber": 0},
+         {"recordMap": {"block": chunk_blocks}, "cursor": {"stack": []}}),
+        ("syncRecordValues", {"requests": [{"pointer": {"table": "block", "id": i}, "version": -1}
+                                           for i in child_blocks]},
+         {"recordMap": {"block": child_blocks}}),
+    ] + [
+        ("loadPageChunk", {"pageId": page_id, "chunkNumber": 0},
+         {"recordMap": {"block": blocks}, "cursor": {"stack": []}})
+        for page_id, blocks in subpage_chunks.items()
+    ]
+    for endpoint, request, response in exchanges:
+        with open(record_dir / f"{request_key(endpoint, request)}.json", "w", encoding="utf-8") as f:
+            json.dump({"endpoint": endpoint, "request": request, "response": response}, f, indent=2)
+    return f"https://stub.notion.site/Demos-Anon-{STUB_PAGE_ID.replace('-', '')}"
+
+# --------------------------- Server ------------------------------------------
+class _StubHandler(QuietHandler):
+    def do_POST(self):
+        server = self.owner
+        server.count_request()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        endpoint = self.path.split("?")[0][len(NOTION_API_PATH):]
+        reply = server.answer(endpoint, body) if self.path.startswith(NOTION_API_PATH) else None
+        if reply is None:
+            self.send_body(404, b'{"errorId":"not-recorded"}', "application/json")
+        else:
+            self.send_body(200, json.dumps(reply).encode("utf-8"), "application/json")
+
+    def do_GET(self):
+        self.owner.count_request()
+        if self.path.startswith("/image/"):
+            self.send_body(200, PLACEHOLDER_PNG, "image/png")
+        else:
+            self.send_body(404, b"", "text/plain")
+
+class NotionStubServer(LocalServer):
+    """
+    Local stand-in for a public Notion site: replays recorded loadPageChunk /
+    syncRecordValues responses and serves a placeholder PNG for /image/ URLs.
+    """
+
+    handler = _StubHandler
+
+    def __init__(self, record_dir: Path, latency: float = 0.0, port: int = 0):
+        super().__init__(port)
+        self.chunks, self.blocks = load_recordings(record_dir)
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+
+    def answer(self, endpoint: str, body: dict) -> Optional[dict]:
+        if endpoint == "loadPageChunk":
+            return self.chunks.get((body.get("pageId"), body.get("chunkNumber", 0)))
+        if endpoint == "syncRecordValues":
+            ids = [r["pointer"]["id"] for r in body.get("requests", [])]
+            return {"recordMap": {"block": {i: self.blocks[i] for i in ids if i in self.blocks}}}
+        return None
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve recorded Notion API responses for the HTTP scraper backend.")
+    parser.add_argument("record_dir", type=str, help="Directory written by scrape_images_from_notion.py --record.")
+    parser.add_argument("--port", type=int, default=8787, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each reply.")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="SESSIONS",
+                        help="First write a synthetic recording with this many sessions into record_dir.")
+    parser.add_argument("--subpages", type=int, default=0,
+                        help="Synthetic recording: linked sub-pages per session (for --crawl-depth).")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.synthetic:
+        url = write_synthetic_recording(Path(args.record_dir), args.synthetic, subpages_per_session=args.subpages)
+        print(f"Synthetic page: {url}")
+    with NotionStubServer(Path(args.record_dir), args.latency, args.port) as server:
+        print(f"Serving {args.record_dir} at {server.base_url} (pass --api-base {server.base_url})")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
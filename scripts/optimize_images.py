@@ -0,0 +1,116 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from PIL import Image, ImageOps, features
+
+from session_assets import add_build_args, update_image_manifest
+
+# --------------------------- Defaults ----------------------------------------
+VARIANT_WIDTHS: Sequence[int] = (320, 640, 1280)
+VARIANT_FORMATS: Sequence[str] = ("webp", "avif")
+VARIANT_QUALITY: Dict[str, int] = {"webp": 78, "avif": 55}
+VARIANTS_DIR: str = "variants"                     # per session: session{N}/variants/
+VARIANTS_MANIFEST: str = "image-variants.json"     # at the root of the sessions tree
+
+# --------------------------- Helpers -----------------------------------------
+def available_formats(formats: Sequence[str]) -> List[str]:
+    """Drop formats this Pillow build can't encode (AVIF needs Pillow >= 11.2)."""
+    usable = []
+    for fmt in formats:
+        if features.check(fmt):
+            usable.append(fmt)
+        else:
+            print(f"[WARN] Pillow has no {fmt.upper()} encoder; skipping {fmt} variants.")
+    return usable
+
+def target_widths(width: int, widths: Sequence[int]) -> List[int]:
+    """Requested widths below the original, plus one capped at the original (never upscale)."""
+    return sorted({w for w in widths if w < width} | {min(width, max(widths))})
+
+def build_variants(root: str, rel: str, widths: Sequence[int], formats: Sequence[str]) -> dict:
+    """
+    Resize one original into every width/format pair under session{N}/variants/.
+    Runs in a worker process. EXIF/XMP are dropped; the ICC profile is kept so colours survive.
+    """
+    root_path = Path(root)
+    src = root_path / rel
+    out_dir = src.parent / VARIANTS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(src) as opened:
+        im = ImageOps.exif_transpose(opened)
+        icc = opened.info.get("icc_profile")
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if has_alpha else "RGB")
+        width, height = im.size
+
+        variants = []
+        for w in target_widths(width, widths):
+            h = max(1, round(height * w / width))
+            resized = im if w == width else im.resize((w, h), Image.LANCZOS)
+            for fmt in formats:
+                out_path = out_dir / f"{src.stem}-{w}w.{fmt}"
+                options = {"quality": VARIANT_QUALITY.get(fmt, 75)}
+                if icc:
+                    options["icc_profile"] = icc
+                resized.save(out_path, format=fmt.upper(), **options)
+                variants.append({
+                    "file": out_path.relative_to(root_path).as_posix(),
+                    "format": fmt,
+                    "width": w,
+                    "height": h,
+                    "bytes": out_path.stat().st_size,
+                })
+    return {"width": width, "height": height, "variants": variants}
+
+def _variants_present(root: Path, entry: dict) -> bool:
+    return all((root / v["file"]).is_file() for v in entry.get("variants", []))
+
+def _remove_variants(root: Path, entry: Optional[dict], keep: Sequence[str] = ()) -> None:
+    for v in (entry or {}).get("variants", []):
+        if v["file"] not in keep:
+            (root / v["file"]).unlink(missing_ok=True)
+
+# --------------------------- Pipeline ----------------------------------------
+def optimize_tree(root: Path,
+                  widths: Sequence[int] = VARIANT_WIDTHS,
+                  formats: Sequence[str] = VARIANT_FORMATS,
+                  workers: Optional[int] = None,
+                  force: bool = False,
+                  sessions: Optional[Sequence[int]] = None) -> Dict[str, int]:
+    """
+    Build resized variants for every session image under root and record them in
+    root/image-variants.json. Originals whose sha256 matches the manifest (and whose
+    variants still exist) are skipped; variants nothing refers to any more are deleted.
+    """
+    root = Path(root)
+    widths = sorted(set(widths))
+    formats = available_formats(formats)
+
+    def replace(old: Optional[dict], new: Optional[dict]) -> None:
+        _remove_variants(root, old, keep=[v["file"] for v in (new or {}).get("variants", [])])
+
+    return update_image_manifest(
+        root, VARIANTS_MANIFEST, {"widths": widths, "formats": formats},
+        build_variants, (widths, formats), workers=workers, force=force, sessions=sessions,
+        is_fresh=lambda entry: _variants_present(root, entry), on_replace=replace,
+    )
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build resized WebP/AVIF variants of session images for srcset.")
+    add_build_args(parser)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(VARIANT_WIDTHS), help="Variant widths in px.")
+    parser.add_argument("--formats", type=str, nargs="+", default=list(VARIANT_FORMATS),
+                        choices=["webp", "avif"], help="Variant formats.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    stats = optimize_tree(Path(args.input), args.widths, args.formats, args.workers, args.force)
+    print(f"\nDone. Optimised {stats['processed']} images, skipped {stats['skipped']} unchanged, "
+          f"removed {stats['removed']} stale, {stats['failed']} failed.")
+
+if __name__ == "__main__":
+    main()
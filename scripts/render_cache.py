@@ -0,0 +1,152 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from session_assets import load_json, write_json_atomic
+
+# --------------------------- Defaults ----------------------------------------
+RENDER_CACHE_DIR: Path = Path(__file__).resolve().parent.parent / ".render-cache"
+RENDER_CACHE_TTL: float = 3600.0            # seconds; Notion's signed image URLs in the HTML expire after ~1h
+RENDER_CACHE_MAX_BYTES: int = 200 << 20     # compressed bytes kept before least-recently-used eviction
+RENDER_CACHE_LEVEL: int = 6                 # gzip level: HTML shrinks ~10x and decompresses in milliseconds
+INDEX_NAME: str = "index.json"
+
+# --------------------------- Cache -------------------------------------------
+class RenderCache:
+    """
+    Gzipped snapshots of rendered Notion pages, keyed by URL plus a variant for
+    renders that only hold part of the page (e.g. a targeted session range).
+    Entries older than ttl are ignored; refresh ignores every entry but still
+    stores new renders. index.json tracks size and last use, and the least
+    recently used snapshots are evicted once the total passes max_bytes.
+    """
+
+    def __init__(self, root: Path = RENDER_CACHE_DIR,
+                 ttl: float = RENDER_CACHE_TTL,
+                 max_bytes: int = RENDER_CACHE_MAX_BYTES,
+                 refresh: bool = False):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = (load_json(self.root / INDEX_NAME, {}) or {}).get("entries", {})
+
+    @staticmethod
+    def key(url: str, variant: str = "") -> str:
+        return hashlib.sha256(json.dumps([url, variant]).encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.html.gz"
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.root / INDEX_NAME, {"version": 1, "entries": self.entries})
+
+    def get(self, url: str, variant: str = "") -> Optional[str]:
+        """Cached HTML for url, or None if missing, expired or refreshing."""
+        if self.refresh:
+            return None
+        key = self.key(url, variant)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry["created"] > self.ttl:
+                return None
+            try:
+                data = self.path(key).read_bytes()
+            except FileNotFoundError:
+                del self.entries[key]
+                return None
+            entry["used"] = time.time()
+            self._save_index()
+        return gzip.decompress(data).decode("utf-8")
+
+    def age(self, url: str, variant: str = "") -> Optional[float]:
+        entry = self.entries.get(self.key(url, variant))
+        return None if entry is None else time.time() - entry["created"]
+
+    def put(self, url: str, html: str, variant: str = "") -> None:
+        key = self.key(url, variant)
+        data = gzip.compress(html.encode("utf-8"), compresslevel=RENDER_CACHE_LEVEL)
+        path = self.path(key)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            now = time.time()
+            self.entries[key] = {"url": url, "variant": variant, "created": now, "used": now,
+                                 "bytes": len(data), "html_bytes": len(html.encode("utf-8"))}
+            self._evict(keep=key)
+            self._save_index()
+
+    def _evict(self, keep: str = "") -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes. Caller holds the lock."""
+        now = time.time()
+        removed = 0
+        for key in [k for k, e in self.entries.items() if now - e["created"] > self.ttl and k != keep]:
+            self._remove(key)
+            removed += 1
+        total = sum(e["bytes"] for e in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self.entries[key]["bytes"]
+            self._remove(key)
+            removed += 1
+        return removed
+
+    def _remove(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+        del self.entries[key]
+
+    def prune(self) -> int:
+        with self._lock:
+            removed = self._evict()
+            self._save_index()
+        return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self.entries)
+            for key in list(self.entries):
+                self._remove(key)
+            self._save_index()
+        return removed
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect or empty the cache of rendered Notion pages.")
+    parser.add_argument("--cache-dir", type=str, default=str(RENDER_CACHE_DIR), help="Cache directory.")
+    parser.add_argument("--ttl", type=float, default=RENDER_CACHE_TTL, help="Seconds a snapshot stays fresh.")
+    parser.add_argument("--max-mb", type=float, default=RENDER_CACHE_MAX_BYTES / 1e6, help="Size bound in MB.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show cached snapshots, newest first.")
+    sub.add_parser("prune", help="Remove expired snapshots and enforce the size bound.")
+    sub.add_parser("clear", help="Remove every snapshot.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    cache = RenderCache(Path(args.cache_dir), args.ttl, int(args.max_mb * 1e6))
+    if args.command == "clear":
+        print(f"Removed {cache.clear()} snapshots.")
+    elif args.command == "prune":
+        print(f"Removed {cache.prune()} snapshots.")
+    else:
+        now = time.time()
+        for e in sorted(cache.entries.values(), key=lambda e: -e["created"]):
+            state = "stale" if now - e["created"] > cache.ttl else "fresh"
+            print(f"{state}  {(now - e['created']) / 60:6.1f} min  {e['bytes'] / 1e3:8.1f} kB  "
+                  f"{e['url']}{' [' + e['variant'] + ']' if e['variant'] else ''}")
+
+if __name__ == "__main__":
+    main()
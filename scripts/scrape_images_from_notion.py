@@ -1,16 +1,34 @@
 import argparse
+import base64
+import cProfile
+import hashlib
+import html as html_lib
+import json
 import os
+import random
 import re
+import shutil
 import time
 import urllib.parse
 import mimetypes
+import threading
 import requests
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from blob_store import BlobStore, LINK_MODES
+from render_cache import RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES, RENDER_CACHE_TTL, RenderCache
+from session_assets import file_sha256, load_json, write_json_atomic
 
 # Selenium
 from selenium import webdriver
@@ -33,6 +51,31 @@ BASE_IMG_DIR: str = "sessions"        # root directory to write images
 REQUEST_TIMEOUT: int = 60
 SCROLL_PAUSE: float = 0.5
 MAX_SCROLL_PASSES: int = 40
+MAX_TOGGLE_PASSES: int = 10           # event-driven render: nested toggle levels to open
+DOM_QUIET_MS: int = 300               # no DOM mutations for this long => page has settled
+RENDER_WAIT_TIMEOUT: float = 15.0     # upper bound for any single in-page wait (seconds)
+DOWNLOAD_WORKERS: int = 8             # concurrent image downloads
+MAX_CONNECTIONS_PER_HOST: int = 6     # in-flight requests per image host
+NOTION_API_PATH: str = "/api/v3/"      # public page API used by the HTTP backend
+NOTION_CHUNK_LIMIT: int = 100
+NOTION_SYNC_BATCH: int = 100
+MAX_RETRIES: int = 4                  # extra attempts per image after the first
+BACKOFF_BASE: float = 0.5             # first retry waits up to this long (seconds), doubling each time
+BACKOFF_MAX: float = 30.0             # ceiling for one backoff wait and for honoured Retry-After
+MIN_HOST_RATE: float = 0.5            # adaptive pacing never drops below this (requests/s per host)
+RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+THROTTLE_STATUSES = (429, 503)
+MANIFEST_NAME: str = ".sync-manifest.json"  # per-output-root record of saved images
+SIGNATURE_PARAMS = ("signature", "expires", "key-pair-id", "policy")
+METRICS_SCHEMA_VERSION: int = 1
+CRAWL_BROWSERS: int = 4               # browser drivers per crawl level when --browsers isn't given
+NOTION_PAGE_HOSTS = ("notion.site", "notion.so")
+CAPTURE_DIR: str = ".capture"         # per-output-root spool for image bodies captured from the browser
+CAPTURE_BUFFER_BYTES: int = 512 << 20  # DevTools response buffer, so bodies survive until they're read
+CAPTURE_RESOURCE_BYTES: int = 64 << 20
+
+# ([(session, image src)], [(session, page link)]) for one page, in document order
+PageItems = Tuple[List[Tuple[Optional[int], str]], List[Tuple[Optional[int], str]]]
 
 # --------------------------- Helpers -----------------------------------------
 def ensure_dir(path: Path) -> None:
@@ -43,6 +86,22 @@ def session_number_from_text(text: str) -> Optional[int]:
     m = re.search(r"\bSession\s+(\d+)\b", text, flags=re.IGNORECASE)
     return int(m.group(1)) if m else None
 
+def notion_page_id(url: str) -> Optional[str]:
+    """The Notion page id a URL points at (trailing 32 hex chars of its path) as a dashed UUID, if any."""
+    m = re.search(r"([0-9a-f]{32})$", urllib.parse.urlsplit(url).path.replace("-", ""), re.IGNORECASE)
+    if not m:
+        return None
+    h = m.group(1).lower()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+def is_notion_page_link(url: str, base_url: str) -> bool:
+    """True for links to another page on the same Notion site (or notion.so)."""
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    same_site = host == urllib.parse.urlsplit(base_url).netloc.lower()
+    return notion_page_id(url) is not None and (
+        same_site or any(host == h or host.endswith("." + h) for h in NOTION_PAGE_HOSTS)
+    )
+
 def best_img_src(node) -> Optional[str]:
     """Choose the best available URL for a Notion <img>."""
     src = node.get("src") or node.get("data-src")
@@ -53,25 +112,595 @@ def best_img_src(node) -> Optional[str]:
             src = first
     return src
 
+# --------------------------- Streaming extractor -----------------------------
+SESSION_HEADING_RE = re.compile(r"Session\s+(\d+)", flags=re.IGNORECASE)
+
+# Mirrors bs4's html.parser tree builder: void tags close immediately, and
+# strings inside these containers are excluded from their ancestors' get_text().
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link",
+    "menuitem", "meta", "param", "source", "track", "wbr", "basefont", "bgsound",
+    "command", "frame", "image", "isindex", "nextid", "spacer",
+})
+STRING_CONTAINER_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+class _OpenTag:
+    """
+    An open element while streaming. Holds just enough of its text to find the
+    first 'Session {n}' in it, plus the images waiting on that answer.
+    """
+    __slots__ = ("name", "resolved", "session", "last", "buf", "prev_word", "waiting")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.resolved = False                  # first match (or lack of one) is known
+        self.session: Optional[int] = None     # first session number in this tag's text
+        self.last: Optional[int] = None        # latest match among closed descendants
+        self.buf = ""                          # unscanned tail of this tag's text
+        self.prev_word: Optional[bool] = None  # is the char before buf a word char? None = text start
+        self.waiting: List[list] = []          # pending images blocked on this tag
+
+    def feed(self, text: str) -> bool:
+        """Append text; return True if this tag just resolved."""
+        if self.resolved:
+            return False
+        self.buf += text
+        return self._scan(final=False)
+
+    def close(self) -> bool:
+        if self.resolved:
+            return False
+        if not self._scan(final=True):
+            self.resolved = True
+        self.buf = ""
+        return True
+
+    def _scan(self, final: bool) -> bool:
+        buf = self.buf
+        for m in SESSION_HEADING_RE.finditer(buf):
+            start, end = m.span()
+            before = buf[start - 1] if start else None
+            if (before is not None and _is_word_char(before)) or (before is None and self.prev_word):
+                continue
+            if end == len(buf) and not final:
+                # digits run to the end of what we've seen; wait for more text
+                self._keep_from(start)
+                return False
+            if end < len(buf) and _is_word_char(buf[end]):
+                continue
+            self.resolved = True
+            self.session = int(m.group(1))
+            self.buf = ""
+            return True
+        # Keep only a tail that could still grow into a match ("Sess", "Session  ").
+        keep = len(buf) - len(buf.rstrip()) + len("Session")
+        self._keep_from(max(0, len(buf) - keep))
+        return False
+
+    def _keep_from(self, start: int) -> None:
+        if start:
+            self.prev_word = _is_word_char(self.buf[start - 1])
+            self.buf = self.buf[start:]
+
+class SessionImageExtractor(HTMLParser):
+    """
+    Single-pass equivalent of collect_images_by_session_tree().
+
+    The tree walk sets the current session from the first 'Session {n}' in each
+    tag's full text, visiting tags in document order. Here a tag's text isn't known
+    when it opens, so each open tag scans its text incrementally and an <img> that
+    depends on an unresolved ancestor waits on it. Tags cost constant work; each
+    text node is scanned once per open ancestor that hasn't found its session yet,
+    so text costs up to nesting depth x its length. Memory is bounded by nesting
+    depth plus the images found.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # The document itself never names a session but carries "last" for top-level tags.
+        root = _OpenTag("[document]")
+        root.resolved = True
+        self.stack: List[_OpenTag] = [root]
+        self.images: List[list] = []  # [src, session, ...] in document order; see _place
+        self.links: List[list] = []   # same shape, for <a href> that look like Notion page links
+        self._text: List[str] = []
+        self._closed_voids: Counter = Counter()  # void tags whose stray </tag> bs4 ignores
+
+    # ---- text ----
+    def _flush_text(self) -> None:
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        container = next((t.name for t in reversed(self.stack) if t.name in STRING_CONTAINER_TAGS), None)
+        self._feed_text(text, container)
+
+    def _feed_text(self, text: str, container: Optional[str]) -> None:
+        text = text.strip()
+        if not text:
+            return
+        for tag in self.stack:
+            counts = tag.name == container if container else tag.name not in STRING_CONTAINER_TAGS
+            if counts and tag.feed(text):
+                self._release(tag)
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_decl(self, decl):
+        self._flush_text()
+
+    def handle_pi(self, data):
+        self._flush_text()
+
+    def unknown_decl(self, data):
+        self._flush_text()
+        if data.upper().startswith("CDATA["):
+            self._feed_text(data[len("CDATA["):], None)
+
+    # ---- tags ----
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, close_void=True)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, close_void=False)
+        self._end(tag)
+
+    def _start(self, tag, attrs, close_void: bool) -> None:
+        self._flush_text()
+        if tag == "img":
+            src = best_img_src({k: ("" if v is None else v) for k, v in attrs})
+            if src:
+                self._place(self.images, src)
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if href and notion_page_id(href):
+                self._place(self.links, href)
+        self.stack.append(_OpenTag(tag))
+        if close_void and tag in VOID_TAGS:
+            self._pop()
+            self._closed_voids[tag] += 1
+
+    def handle_endtag(self, tag):
+        if self._closed_voids[tag] > 0:
+            # Redundant </img> etc.: bs4 drops it without even ending the current string.
+            self._closed_voids[tag] -= 1
+            return
+        self._end(tag)
+
+    def _end(self, tag: str) -> None:
+        self._flush_text()
+        if not any(t.name == tag for t in self.stack):
+            return
+        while self.stack:
+            if self._pop().name == tag:
+                break
+
+    def _pop(self) -> _OpenTag:
+        tag = self.stack.pop()
+        if tag.close():
+            self._release(tag)
+        out = tag.last if tag.last is not None else tag.session
+        if out is not None and self.stack:
+            self.stack[-1].last = out
+        return tag
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        while self.stack:
+            self._pop()
+
+    # ---- session attribution ----
+    def _place(self, into: List[list], src: str) -> None:
+        # Walk from the innermost open tag outwards, mirroring "latest tag in
+        # document order whose text names a session".
+        chain: List[_OpenTag] = []
+        fallback: Optional[int] = None
+        for tag in reversed(self.stack):
+            if tag.last is not None:
+                fallback = tag.last
+                break
+            if tag.resolved:
+                if tag.session is not None:
+                    fallback = tag.session
+                    break
+                continue
+            chain.append(tag)
+        entry = [src, None, chain, 0, fallback]  # src, session, chain, position, fallback
+        into.append(entry)
+        self._advance(entry)
+
+    def _advance(self, entry: list) -> None:
+        chain = entry[2]
+        while entry[3] < len(chain):
+            tag = chain[entry[3]]
+            if not tag.resolved:
+                tag.waiting.append(entry)
+                return
+            if tag.session is not None:
+                entry[1] = tag.session
+                break
+            entry[3] += 1
+        else:
+            entry[1] = entry[4]
+        entry[2] = None
+
+    def _release(self, tag: _OpenTag) -> None:
+        waiting, tag.waiting = tag.waiting, []
+        for entry in waiting:
+            self._advance(entry)
+
 def ext_from_url_or_headers(url: str, resp: requests.Response) -> str:
+    return ext_from_url_or_type(url, resp.headers.get("Content-Type", ""))
+
+def ext_from_url_or_type(url: str, ctype: str) -> str:
     # try URL path
     parsed = urllib.parse.urlparse(url)
     ext = os.path.splitext(parsed.path)[1]
     if ext and len(ext) <= 5:
         return ext
     # try content-type
-    ctype = resp.headers.get("Content-Type", "")
     if ctype:
         guess = mimetypes.guess_extension(ctype.split(";")[0].strip())
         if guess:
             return guess
     return ".jpg"
 
+def build_http_session(pool_size: int) -> requests.Session:
+    """One pooled session shared by all download workers."""
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    http.headers.update({
+        "User-Agent": "Mozilla/5.0",
+        "Referer": "https://www.notion.so/"
+    })
+    return http
+
+def is_signature_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith("x-amz-") or name in SIGNATURE_PARAMS
+
+def canonical_image_url(url: str) -> str:
+    """Strip expiring signature params so a re-signed URL maps to the same image."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path
+    # Notion proxies files as /image/<percent-encoded source URL>
+    head, sep, inner = path.partition("/image/")
+    if sep:
+        inner_url = urllib.parse.unquote(inner)
+        if inner_url.startswith("http"):
+            path = head + sep + urllib.parse.quote(canonical_image_url(inner_url), safe="")
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if not is_signature_param(k)]
+    return urllib.parse.urlunsplit(
+        (parts.scheme, parts.netloc, path, urllib.parse.urlencode(query), "")
+    )
+
+class SyncManifest:
+    """
+    Per-output-root record of every saved image, keyed by "session{N}/image{i}".
+    Each entry holds the unsigned source URL, sha256, size and the ETag /
+    Last-Modified validators so later runs can skip or revalidate the file.
+    """
+
+    def __init__(self, output_root: Path):
+        self.output_root = output_root
+        self.path = output_root / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = (load_json(self.path, {}) or {}).get("images", {})
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self.entries.get(key)
+
+    def record(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self.entries[key] = entry
+
+    def is_intact(self, entry: Optional[dict], url: str) -> bool:
+        """True when entry came from this URL and the file on disk still matches it."""
+        if not entry or entry.get("url") != url:
+            return False
+        path = self.output_root / entry["file"]
+        return path.is_file() and path.stat().st_size == entry.get("size")
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": 1, "images": dict(self.entries)}
+        write_json_atomic(self.path, payload)
+
+class NetworkCapture:
+    """
+    Image responses the browser already received while rendering, spooled under
+    output_root/.capture/ by sha256 and looked up by URL: every hop of the request's
+    redirect chain, the sources of the <img> that displayed it, and their unsigned
+    canonical forms. download_images links a match into place instead of fetching it.
+    """
+
+    def __init__(self, output_root: Path):
+        self.spool = Path(output_root) / CAPTURE_DIR
+        self._lock = threading.Lock()
+        self.by_url: Dict[str, dict] = {}
+        self.responses = 0
+
+    def add(self, urls: List[str], body: bytes, mime: str = "", headers: Optional[dict] = None) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.spool / digest
+        if not path.exists():
+            ensure_dir(self.spool)
+            tmp = path.with_name(f"{digest}.{threading.get_ident()}.part")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        entry = {"path": path, "sha256": digest, "size": len(body), "mime": mime or "",
+                 "etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
+        with self._lock:
+            self.responses += 1
+            for url in urls:
+                self.by_url[url] = entry
+            for url in urls:
+                self.by_url.setdefault(canonical_image_url(url), entry)
+
+    def alias(self, known: str, others: List[str]) -> None:
+        """Let others (e.g. an <img>'s src when the browser loaded a srcset candidate) find known's body."""
+        with self._lock:
+            entry = self.by_url.get(known)
+            if entry is not None:
+                for url in others:
+                    self.by_url.setdefault(url, entry)
+                    self.by_url.setdefault(canonical_image_url(url), entry)
+
+    def lookup(self, url: str) -> Optional[dict]:
+        with self._lock:
+            return self.by_url.get(url) or self.by_url.get(canonical_image_url(url))
+
+    @staticmethod
+    def install(entry: dict, dest: Path) -> None:
+        """Put a captured body at dest without re-reading it where possible."""
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(entry["path"], dest)
+        except OSError:
+            shutil.copyfile(entry["path"], dest)
+
+    def close(self) -> None:
+        shutil.rmtree(self.spool, ignore_errors=True)
+
+class HostLimiter:
+    """
+    Caps the number of concurrent requests made to any single host, and paces them
+    once the host starts throttling. Pacing is AIMD: a 429/503 cuts the host's request
+    rate by the share of the last second's requests that were rejected (at most half)
+    and pauses it for any Retry-After; each success nudges the rate back up.
+    Hosts that never throttle are not paced at all, unless max_rate is set.
+    """
+
+    def __init__(self, per_host: int, max_rate: Optional[float] = None):
+        self.per_host = max(1, per_host)
+        self.max_rate = max_rate or None
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._hosts: Dict[str, dict] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urllib.parse.urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> dict:
+        if host not in self._hosts:
+            self._hosts[host] = {"rate": self.max_rate, "next_at": 0.0, "throttles": 0,
+                                 "recent": [], "rejected": [], "last_cut": float("-inf")}
+        return self._hosts[host]
+
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        host = self.host_of(url)
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    def pace(self, url: str) -> None:
+        """Block until this host's pacing allows another request."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(self.host_of(url))
+            state["recent"] = [t for t in state["recent"] if now - t < 1.0] + [now]
+            start = max(now, state["next_at"])
+            if state["rate"] is not None:
+                state["next_at"] = start + 1.0 / state["rate"]
+        if start > now:
+            time.sleep(start - now)
+
+    def succeeded(self, url: str) -> None:
+        with self._lock:
+            state = self._state(self.host_of(url))
+            if state["rate"] is not None and state["throttles"]:
+                # Per second of clean responses the rate grows by 1 request/s plus 10%,
+                # so it probes back up quickly after a cut that overshot.
+                state["rate"] += (1.0 + 0.1 * state["rate"]) / state["rate"]
+                if self.max_rate:
+                    state["rate"] = min(state["rate"], self.max_rate)
+
+    def throttled(self, url: str, retry_after: Optional[float] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(self.host_of(url))
+            state["throttles"] += 1
+            state["rejected"] = [t for t in state["rejected"] if now - t < 1.0] + [now]
+            # One cut per second at most: a burst of rejections from requests already in
+            # flight is a single signal, not one per response.
+            if now - state["last_cut"] >= 1.0:
+                observed = max(1, len([t for t in state["recent"] if now - t < 1.0]))
+                keep = max(0.5, 1.0 - len(state["rejected"]) / observed)
+                state["rate"] = max(MIN_HOST_RATE, (state["rate"] or observed) * keep)
+                state["last_cut"] = now
+            if retry_after:
+                state["next_at"] = max(state["next_at"], now + retry_after)
+
+    def summary(self) -> Dict[str, dict]:
+        """Throttled hosts with how often they pushed back and the rate pacing settled at."""
+        with self._lock:
+            return {host: {"throttles": st["throttles"], "rate": st["rate"]}
+                    for host, st in self._hosts.items() if st["throttles"]}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), capped at BACKOFF_MAX."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(BACKOFF_MAX, max(0.0, seconds))
+
+def is_retryable(exc: Exception) -> bool:
+    """Transient network errors and retryable HTTP statuses; anything else fails at once."""
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout,
+                            requests.exceptions.ChunkedEncodingError))
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+# --------------------------- Metrics -----------------------------------------
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+class ScrapeMetrics:
+    """
+    Thread-safe collector for one scrape: phase durations and render counters per
+    page, plus latency and bytes per image request. report() turns it into the JSON
+    written by --metrics; with profile_path set, the parse phase runs under cProfile.
+    """
+
+    def __init__(self, profile_path: str = ""):
+        self.started = time.perf_counter()
+        self.profile_path = profile_path
+        self._profiler: Optional[cProfile.Profile] = cProfile.Profile() if profile_path else None
+        self._lock = threading.Lock()
+        self.pages: Dict[str, dict] = {}
+        self.downloads: List[dict] = []
+
+    def _page(self, url: str) -> dict:
+        return self.pages.setdefault(url, {"phases": {}})
+
+    @contextmanager
+    def phase(self, url: str, name: str):
+        """Time a block and add it to url's total for that phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(url, name, time.perf_counter() - start)
+
+    def add_phase(self, url: str, name: str, seconds: float) -> None:
+        with self._lock:
+            phases = self._page(url)["phases"]
+            phases[name] = phases.get(name, 0.0) + seconds
+
+    def record(self, url: str, **fields) -> None:
+        with self._lock:
+            self._page(url).update(fields)
+
+    def record_download(self, url: str, status: str, seconds: float, size: int, attempts: int = 1) -> None:
+        with self._lock:
+            self.downloads.append({"url": url, "status": status, "seconds": seconds,
+                                   "bytes": size, "attempts": attempts})
+
+    @contextmanager
+    def profiling(self):
+        if self._profiler is None:
+            yield
+            return
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+
+    def report(self) -> dict:
+        with self._lock:
+            pages = {url: {**page, "phases": dict(page["phases"])} for url, page in self.pages.items()}
+            downloads = list(self.downloads)
+        phases: Dict[str, float] = defaultdict(float)
+        for page in pages.values():
+            for name, secs in page["phases"].items():
+                phases[name] += secs
+
+        fetched = [d for d in downloads if d["status"] != "skipped"]
+        latencies = [d["seconds"] for d in fetched]
+        by_status: Dict[str, int] = defaultdict(int)
+        for d in downloads:
+            by_status[d["status"]] += 1
+        total_bytes = sum(d["bytes"] for d in downloads)
+        download_s = phases.get("download", 0.0)
+        return {
+            "schema": METRICS_SCHEMA_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "wall_s": time.perf_counter() - self.started,
+            "phases": dict(phases),
+            "pages": pages,
+            "downloads": {
+                "requests": len(fetched),
+                "retries": sum(d["attempts"] - 1 for d in downloads),
+                "by_status": dict(by_status),
+                "bytes": total_bytes,
+                "images_per_s": by_status.get("saved", 0) / download_s if download_s else None,
+                "mb_per_s": total_bytes / 1e6 / download_s if download_s else None,
+                "latency_s": {
+                    "p50": _percentile(latencies, 0.5),
+                    "p95": _percentile(latencies, 0.95),
+                    "max": max(latencies) if latencies else None,
+                },
+                "items": downloads,
+            },
+            "profile": self.profile_path or None,
+        }
+
+    def write(self, path: str) -> None:
+        if self._profiler is not None:
+            self._profiler.dump_stats(self.profile_path)
+            print(f"Wrote parse profile to {self.profile_path} (view with: python -m pstats)")
+        if path:
+            write_json_atomic(Path(path), self.report())
+            print(f"Wrote metrics to {path}")
+
 # --------------------------- Base Scraper ------------------------------------
 class BaseNotionImageScraper(ABC):
-    def __init__(self, notion_url: str, output_root: str):
+    def __init__(self, notion_url: str, output_root: str,
+                 workers: int = DOWNLOAD_WORKERS,
+                 per_host: int = MAX_CONNECTIONS_PER_HOST,
+                 store: Optional[BlobStore] = None,
+                 metrics: Optional[ScrapeMetrics] = None,
+                 retries: int = MAX_RETRIES,
+                 max_rate: Optional[float] = None):
         self.notion_url: str = notion_url
         self.output_root: Path = Path(output_root)
+        self.workers: int = max(1, workers)
+        self.per_host: int = max(1, per_host)
+        self.retries: int = max(0, retries)
+        self.max_rate: Optional[float] = max_rate  # requests/s per image host; None = only adaptive pacing
+        self.store: Optional[BlobStore] = store  # when set, images are links into the store
+        self.metrics: ScrapeMetrics = metrics or ScrapeMetrics()
+        self.capture: Optional[NetworkCapture] = None  # images the browser already fetched
         ensure_dir(self.output_root)
 
     @abstractmethod
@@ -83,7 +712,24 @@ class BaseNotionImageScraper(ABC):
     def collect_images_by_session(html: str,
                                   min_session: Optional[int] = None,
                                   max_session: Optional[int] = None) -> Dict[int, List[str]]:
-        soup = BeautifulSoup(html)
+        """Group <img> sources under the preceding 'Session {n}' heading in one streaming pass."""
+        parser = SessionImageExtractor()
+        parser.feed(html)
+        parser.close()
+        imgs: Dict[int, List[str]] = defaultdict(list)
+        for src, session, *_ in parser.images:
+            if session is not None:
+                if (min_session is None or session >= min_session) and \
+                   (max_session is None or session <= max_session):
+                    imgs[session].append(src)
+        return imgs
+
+    @staticmethod
+    def collect_images_by_session_tree(html: str,
+                                       min_session: Optional[int] = None,
+                                       max_session: Optional[int] = None) -> Dict[int, List[str]]:
+        """Original BeautifulSoup tree walk; quadratic in page size, kept for comparison."""
+        soup = BeautifulSoup(html, "html.parser")  # the parser SessionImageExtractor mirrors
         imgs: Dict[int, List[str]] = defaultdict(list)
         current_session: Optional[int] = None
 
@@ -102,38 +748,437 @@ class BaseNotionImageScraper(ABC):
                         imgs[current_session].append(src)
         return imgs
 
-    def download_images(self, images_by_session: Dict[int, List[str]]) -> int:
-        http = requests.Session()
-        http.headers.update({
-            "User-Agent": "Mozilla/5.0",
-            "Referer": "https://www.notion.so/"
-        })
-        total = 0
+    def extract(self, html: str, url: str, collect=None,
+                min_session: Optional[int] = None,
+                max_session: Optional[int] = None) -> Dict[int, List[str]]:
+        """Run an extractor over html, recording the parse phase (and profiling it if enabled)."""
+        collect = collect or BaseNotionImageScraper.collect_images_by_session
+        with self.metrics.phase(url, "parse"), self.metrics.profiling():
+            images_by_session = collect(html, min_session=min_session, max_session=max_session)
+        self.metrics.record(url, html_bytes=len(html.encode("utf-8")),
+                            images_found=sum(len(v) for v in images_by_session.values()))
+        return images_by_session
+
+    @staticmethod
+    def page_items_from_html(html: str) -> PageItems:
+        """(session, src) for every <img> and (session, href) for every Notion page link, in page order."""
+        parser = SessionImageExtractor()
+        parser.feed(html)
+        parser.close()
+        return ([(session, src) for src, session, *_ in parser.images],
+                [(session, href) for href, session, *_ in parser.links])
+
+    def download_images(self, images_by_session: Dict[int, List[str]],
+                        revalidate: bool = False,
+                        start_index: Optional[Dict[int, int]] = None,
+                        page_url: Optional[str] = None) -> int:
+        """
+        Download images into session{N}/image{i}{ext}, returning how many files were written.
+        Images already recorded in the manifest are skipped without a request, unless
+        revalidate is set, in which case a conditional GET checks them with the server.
+        Transient failures are retried with backoff; images still failing go to a retry
+        queue that gets one more pass after everything else, then into the final report.
+        start_index offsets i per session, for sessions split across several pages;
+        page_url is the page the images came from, for the metrics report.
+        """
+        # Build the full job list up front so names stay session{N}/image{i}{ext}
+        # regardless of the order in which downloads complete.
+        jobs: List[Tuple[Path, int, str]] = []
         for session_num in sorted(images_by_session.keys()):
             urls = images_by_session[session_num]
             if not urls:
                 continue
             out_dir = self.output_root / f"session{session_num}"
             ensure_dir(out_dir)
-            for i, url in enumerate(urls, start=1):
-                try:
-                    # prepend url with https://ethereal-society-312.notion.site/
-                    if not url.startswith("http"):
-                        url = urllib.parse.urljoin(self.notion_url, url)
-                    r = http.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+            first = (start_index or {}).get(session_num, 0) + 1
+            for i, url in enumerate(urls, start=first):
+                # prepend url with https://ethereal-society-312.notion.site/
+                if not url.startswith("http"):
+                    url = urllib.parse.urljoin(self.notion_url, url)
+                jobs.append((out_dir, i, url))
+
+        manifest = SyncManifest(self.output_root)
+        http = build_http_session(self.workers)
+        limiter = HostLimiter(self.per_host, self.max_rate)
+        total = 0
+        counts = {"unchanged": 0, "skipped": 0, "captured": 0}
+        failures: Dict[Tuple[Path, int, str], Exception] = {}
+        pending = jobs
+        try:
+            with self.metrics.phase(page_url or self.notion_url, "download"), \
+                 ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for round_no in range(2):  # full pass, then one pass over the retry queue
+                    if not pending:
+                        break
+                    if round_no:
+                        print(f"[INFO] Retrying {len(pending)} queued images...")
+                    retry_queue: List[Tuple[Path, int, str]] = []
+                    futures = {
+                        pool.submit(self._timed_download, http, limiter, manifest,
+                                    out_dir, i, url, revalidate): (out_dir, i, url)
+                        for out_dir, i, url in pending
+                    }
+                    for fut in as_completed(futures):
+                        job = futures[fut]
+                        try:
+                            out_path, status = fut.result()
+                        except Exception as e:
+                            failures[job] = e
+                            if is_retryable(e) and not round_no:
+                                print(f"[WARN] Queued for retry: {job[2]} ({e})")
+                                retry_queue.append(job)
+                            continue
+                        failures.pop(job, None)
+                        if status in ("saved", "captured"):
+                            print(f"Saved: {out_path}{' (from browser)' if status == 'captured' else ''}")
+                            total += 1
+                        if status != "saved":
+                            counts[status] += 1
+                    pending = retry_queue
+        finally:
+            http.close()
+            manifest.save()
+        if counts["captured"]:
+            print(f"[INFO] {counts['captured']} images came from the browser's network capture.")
+        if counts["unchanged"] or counts["skipped"]:
+            print(f"Up to date: {counts['unchanged'] + counts['skipped']} images "
+                  f"({counts['skipped']} without a request).")
+        for host, stats in limiter.summary().items():
+            print(f"[INFO] {host} throttled {stats['throttles']} times; "
+                  f"paced at {stats['rate']:.1f} requests/s by the end.")
+        if failures:
+            print(f"[WARN] {len(failures)} images failed after retries:")
+            for (out_dir, i, url), e in sorted(failures.items(), key=lambda kv: (kv[0][0], kv[0][1])):
+                print(f"  {out_dir.name}/image{i}: {e} ({url})")
+        return total
+
+    def _timed_download(self, http: requests.Session, limiter: HostLimiter,
+                        manifest: SyncManifest, out_dir: Path, index: int,
+                        url: str, revalidate: bool) -> Tuple[Path, str]:
+        """_download_one with backoff retries for transient errors, timed for the metrics report."""
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                out_path, status, size = self._download_one(http, limiter, manifest, out_dir,
+                                                             index, url, revalidate)
+                break
+            except Exception as e:
+                retry_after = None
+                response = getattr(e, "response", None)
+                if isinstance(e, requests.HTTPError) and response is not None \
+                        and response.status_code in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    limiter.throttled(url, retry_after)
+                if attempt >= self.retries or not is_retryable(e):
+                    self.metrics.record_download(url, "failed", time.perf_counter() - start, 0, attempt + 1)
+                    raise
+                time.sleep(max(backoff_delay(attempt), retry_after or 0.0))
+                attempt += 1
+        limiter.succeeded(url)
+        self.metrics.record_download(url, status, time.perf_counter() - start, size, attempt + 1)
+        return out_path, status
+
+    def _download_one(self, http: requests.Session, limiter: HostLimiter,
+                      manifest: SyncManifest, out_dir: Path, index: int,
+                      url: str, revalidate: bool) -> Tuple[Path, str, int]:
+        """Fetch one image; returns (path, "saved"|"captured"|"unchanged"|"skipped", bytes received)."""
+        key = f"{out_dir.name}/image{index}"
+        canonical = canonical_image_url(url)
+        entry = manifest.get(key)
+        intact = manifest.is_intact(entry, canonical)
+        if intact and not revalidate:
+            return self.output_root / entry["file"], "skipped", 0
+
+        captured = self.capture.lookup(url) if self.capture is not None else None
+        if captured is not None:
+            out_path = out_dir / f"image{index}{ext_from_url_or_type(url, captured['mime'])}"
+            tmp_path = out_path.with_name(out_path.name + ".part")
+            self.capture.install(captured, tmp_path)
+            digest, size = captured["sha256"], captured["size"]
+            validators = (captured["etag"], captured["last_modified"])
+        else:
+            headers = {}
+            if intact:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+            with limiter.slot(url):
+                limiter.pace(url)
+                r = http.get(url, timeout=REQUEST_TIMEOUT, stream=True, headers=headers)
+                with r:
+                    if intact and r.status_code == 304:
+                        return self.output_root / entry["file"], "unchanged", 0
                     r.raise_for_status()
                     ext = ext_from_url_or_headers(url, r)
-                    out_path = out_dir / f"image{i}{ext}"
-                    with open(out_path, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=1 << 14):
-                            if chunk:
-                                f.write(chunk)
-                    print(f"Saved: {out_path}")
-                    total += 1
-                except Exception as e:
-                    print(f"[WARN] Failed to download {url}: {e}")
+                    out_path = out_dir / f"image{index}{ext}"
+                    tmp_path = out_path.with_name(out_path.name + ".part")
+                    h = hashlib.sha256()
+                    size = 0
+                    try:
+                        with open(tmp_path, "wb") as f:
+                            for chunk in r.iter_content(chunk_size=1 << 14):
+                                if chunk:
+                                    f.write(chunk)
+                                    h.update(chunk)
+                                    size += len(chunk)
+                    except BaseException:
+                        tmp_path.unlink(missing_ok=True)
+                        raise
+                    validators = (r.headers.get("ETag"), r.headers.get("Last-Modified"))
+            digest = h.hexdigest()
+
+        previous = self.output_root / entry["file"] if entry else None
+        if entry and previous == out_path and entry.get("sha256") == digest and out_path.is_file():
+            unchanged = out_path.stat().st_size == size
+        else:
+            unchanged = out_path.is_file() and out_path.stat().st_size == size \
+                and file_sha256(out_path) == digest
+        if unchanged:
+            tmp_path.unlink()
+            if self.store is not None and not self.store.is_linked(out_path, digest):
+                self.store.put_file(out_path, digest)
+                self.store.link(digest, out_path)
+        else:
+            if self.store is not None:
+                self.store.put_file(tmp_path, digest, move=True)
+                self.store.link(digest, out_path)
+            else:
+                os.replace(tmp_path, out_path)
+            if previous is not None and previous != out_path and previous.is_file():
+                previous.unlink()  # extension changed; drop the stale file
+
+        manifest.record(key, {
+            "url": canonical,
+            "file": out_path.relative_to(self.output_root).as_posix(),
+            "sha256": digest,
+            "size": size,
+            "etag": validators[0],
+            "last_modified": validators[1],
+        })
+        if unchanged:
+            return out_path, "unchanged", size
+        return out_path, "saved" if captured is None else "captured", size
+
+# --------------------------- Crawling ----------------------------------------
+class CrawlingNotionScraper(BaseNotionImageScraper):
+    """Backends that can fetch many pages at once, and so follow sub-page links."""
+
+    @abstractmethod
+    def fetch_pages(self, urls: List[str]) -> Iterator[Tuple[str, Optional[PageItems]]]:
+        """Yield (url, page items) for each URL in input order, fetching concurrently; None for failures."""
+        raise NotImplementedError
+
+    def crawl(self, max_depth: int,
+              min_session: Optional[int] = None,
+              max_session: Optional[int] = None,
+              urls: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[int, List[str]]]]:
+        """
+        Breadth-first walk from urls (default: notion_url) through Notion page links
+        found under 'Session {n}' headings, yielding (page url, images by session) in
+        BFS order. Everything on a sub-page, including its own links, belongs to the session
+        whose heading led to it. Pages are deduplicated by page id and each level is
+        fetched concurrently by fetch_pages.
+        """
+        def wanted(session: Optional[int]) -> bool:
+            return session is not None and (min_session is None or session >= min_session) and \
+                (max_session is None or session <= max_session)
+
+        level: List[Tuple[str, Optional[int]]] = []  # (url, parent session)
+        visited = set()
+        for url in urls or [self.notion_url]:
+            page_id = notion_page_id(url) or url
+            if page_id not in visited:
+                visited.add(page_id)
+                level.append((url, None))
+        for depth in range(max_depth + 1):
+            if not level:
+                break
+            next_level: List[Tuple[str, Optional[int]]] = []
+            fetched = self.fetch_pages([url for url, _ in level])
+            for (url, parent), (_, items) in zip(level, fetched):
+                if items is None:
+                    continue
+                images, links = items
+                imgs: Dict[int, List[str]] = defaultdict(list)
+                for session, src in images:
+                    session = parent if parent is not None else session
+                    if wanted(session):
+                        imgs[session].append(urllib.parse.urljoin(url, src))
+                if depth < max_depth:
+                    for session, href in links:
+                        session = parent if parent is not None else session
+                        target = urllib.parse.urljoin(url, href)
+                        page_id = notion_page_id(target)
+                        if wanted(session) and page_id not in visited and is_notion_page_link(target, url):
+                            visited.add(page_id)
+                            next_level.append((target, session))
+                yield url, imgs
+            print(f"[INFO] Crawl depth {depth}: {len(level)} pages, {len(next_level)} new sub-pages")
+            level = next_level
+
+    def crawl_and_download(self, max_depth: int,
+                           min_session: Optional[int] = None,
+                           max_session: Optional[int] = None,
+                           revalidate: bool = False,
+                           urls: Optional[List[str]] = None) -> int:
+        """Crawl and download each page's images as it arrives; sub-page images continue their session's numbering."""
+        offsets: Dict[int, int] = defaultdict(int)
+        total = 0
+        for url, images_by_session in self.crawl(max_depth, min_session, max_session, urls):
+            found = sum(len(v) for v in images_by_session.values())
+            print(f"Crawled {url}: {found} images in {len(images_by_session)} sessions")
+            self.metrics.record(url, images_found=found)
+            total += self.download_images(images_by_session, revalidate=revalidate,
+                                          start_index=offsets, page_url=url)
+            for num, srcs in images_by_session.items():
+                offsets[num] += len(srcs)
         return total
 
+# --------------------------- In-page scripts ---------------------------------
+# Clicks every collapsed toggle in one call. Same targets as _expand_all_toggles;
+# a Set guards against clicking an element twice (which would collapse it again).
+TOGGLE_TARGETS_JS = """
+function toggleTargets() {
+  const targets = new Set();
+  document.querySelectorAll('[aria-expanded="false"]').forEach(el => targets.add(el));
+  document.querySelectorAll('details:not([open]) > summary').forEach(el => targets.add(el));
+  document.querySelectorAll(
+    'button[aria-label*="toggle" i], div[aria-label*="toggle" i], span[aria-label*="toggle" i],' +
+    'button[title*="toggle" i], div[title*="toggle" i], span[title*="toggle" i]'
+  ).forEach(el => { if ((el.getAttribute('aria-expanded') || '').toLowerCase() !== 'true') targets.add(el); });
+  return targets;
+}
+"""
+
+EXPAND_TOGGLES_JS = TOGGLE_TARGETS_JS + """
+let clicked = 0;
+for (const el of toggleTargets()) {
+  try { el.click(); clicked++; } catch (e) {}
+}
+return clicked;
+"""
+
+# 'Session {n}' headings in document order as {n, block}, where block is the Notion
+# block (or element) holding the text. Mentions inside another session's block are
+# that session's content, not headings. Called with arguments [min, max] (null = open).
+SESSION_RANGE_JS = """
+const [lo, hi] = arguments;
+const inRange = n => (lo === null || n >= lo) && (hi === null || n <= hi);
+function sessionMarkers() {
+  const re = /\\bSession\\s+(\\d+)\\b/i;
+  const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+  const markers = [];
+  for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    const m = re.exec(node.nodeValue);
+    const el = node.parentElement;
+    if (!m || !el || el.closest('script, style, template')) continue;
+    const block = el.closest('[data-block-id]') || el;
+    if (markers.some(k => k.block === block || k.block.contains(block))) continue;
+    markers.push({n: parseInt(m[1], 10), block});
+  }
+  return markers;
+}
+"""
+
+# {passed, wanted, height}: passed once a heading outside the range follows one inside it.
+RANGE_SCROLL_STATE_JS = SESSION_RANGE_JS + """
+const markers = sessionMarkers();
+let wanted = 0, passed = false;
+for (const k of markers) {
+  if (inRange(k.n)) wanted++;
+  else if (wanted) { passed = true; break; }
+}
+return {passed, wanted, height: document.body.scrollHeight};
+"""
+
+# Like EXPAND_TOGGLES_JS, but only clicks toggles belonging to an in-range session:
+# the heading inside the toggle's own block, else the last heading before it.
+EXPAND_RANGE_TOGGLES_JS = SESSION_RANGE_JS + TOGGLE_TARGETS_JS + """
+const markers = sessionMarkers();
+function sessionOf(el) {
+  const block = el.closest('[data-block-id]') || el.parentElement;
+  const own = markers.find(k => block && (block === k.block || block.contains(k.block)));
+  if (own) return own.n;
+  let n = null;
+  for (const k of markers) {
+    if (k.block.compareDocumentPosition(el) & Node.DOCUMENT_POSITION_FOLLOWING) n = k.n;
+    else break;
+  }
+  return n;
+}
+let clicked = 0;
+for (const el of toggleTargets()) {
+  const n = sessionOf(el);
+  if (n === null || !inRange(n)) continue;
+  try { el.click(); clicked++; } catch (e) {}
+}
+return clicked;
+"""
+
+# HTML from the first in-range heading up to the next out-of-range heading after the
+# last in-range one (null if none is on the page). Ancestors cut by the range are
+# cloned too, so the fragment keeps the structure the extractors expect.
+EXTRACT_RANGE_HTML_JS = SESSION_RANGE_JS + """
+const markers = sessionMarkers();
+const first = markers.findIndex(k => inRange(k.n));
+if (first < 0) return null;
+let last = first;
+markers.forEach((k, i) => { if (inRange(k.n)) last = i; });
+const range = document.createRange();
+range.selectNodeContents(document.body);
+range.setStartBefore(markers[first].block);
+if (last + 1 < markers.length) range.setEndBefore(markers[last + 1].block);
+const box = document.createElement('div');
+box.appendChild(range.cloneContents());
+return box.innerHTML;
+"""
+
+# Resolves once the DOM has gone quietMs without a mutation (or timeoutMs passes).
+WAIT_FOR_DOM_QUIET_JS = """
+const [quietMs, timeoutMs, done] = arguments;
+const start = performance.now();
+let timer = null, hard = null;
+const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quietMs); });
+function finish() {
+  observer.disconnect(); clearTimeout(timer); clearTimeout(hard);
+  done(performance.now() - start);
+}
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(finish, quietMs);
+hard = setTimeout(finish, timeoutMs);
+"""
+
+# Resolves when every started image (eager, or lazy but in the viewport) has loaded or
+# failed; returns how many were still pending if timeoutMs ran out first.
+WAIT_FOR_IMAGES_JS = """
+const [timeoutMs, done] = arguments;
+const inView = img => { const r = img.getBoundingClientRect(); return r.bottom >= 0 && r.top <= innerHeight; };
+const pending = Array.from(document.images)
+  .filter(img => !img.complete && (img.loading !== 'lazy' || inView(img)));
+let left = pending.length;
+if (!left) return done(0);
+const hard = setTimeout(() => done(left), timeoutMs);
+const settle = () => { if (--left === 0) { clearTimeout(hard); done(0); } };
+pending.forEach(img => {
+  img.addEventListener('load', settle, {once: true});
+  img.addEventListener('error', settle, {once: true});
+});
+"""
+
+# [currentSrc, src, data-src, first srcset candidate] per <img>, resolved against the page.
+IMAGE_SOURCES_JS = """
+const abs = u => { try { return u ? new URL(u, document.baseURI).href : ''; } catch (e) { return ''; } };
+return Array.from(document.images, img => [
+  img.currentSrc,
+  abs(img.getAttribute('src')),
+  abs(img.getAttribute('data-src')),
+  abs((img.getAttribute('srcset') || '').split(',')[0].trim().split(' ')[0]),
+]);
+"""
+
 # --------------------------- Selenium Scraper --------------------------------
 class SeleniumNotionImageScraper(BaseNotionImageScraper):
     """
@@ -150,8 +1195,20 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
                  chrome_driver_path: str = "",
                  edge_path: str = "",
                  edge_driver_path: str = "",
-                 user_agent: str = ""):
-        super().__init__(notion_url, output_root)
+                 user_agent: str = "",
+                 render_mode: str = "events",  # "events", "targeted" or "fixed" (legacy sleeps)
+                 min_session: Optional[int] = None,
+                 max_session: Optional[int] = None,
+                 capture: Optional[NetworkCapture] = None,
+                 cache: Optional[RenderCache] = None,
+                 workers: int = DOWNLOAD_WORKERS,
+                 per_host: int = MAX_CONNECTIONS_PER_HOST,
+                 store: Optional[BlobStore] = None,
+                 metrics: Optional[ScrapeMetrics] = None,
+                 retries: int = MAX_RETRIES,
+                 max_rate: Optional[float] = None):
+        super().__init__(notion_url, output_root, workers=workers, per_host=per_host,
+                         store=store, metrics=metrics, retries=retries, max_rate=max_rate)
         self.browser = browser.lower()
         self.headless = headless
         self.chrome_path = chrome_path
@@ -159,14 +1216,40 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
         self.edge_path = edge_path
         self.edge_driver_path = edge_driver_path
         self.user_agent = user_agent
-        self.driver = self._build_driver()
+        self.render_mode = render_mode.lower()
+        self.session_range = (min_session, max_session)  # what "targeted" rendering expands and returns
+        self.range_found = False
+        if self.render_mode == "targeted" and min_session is None and max_session is None:
+            print("[WARN] Targeted rendering needs --min-session and/or --max-session; rendering the whole page.")
+            self.render_mode = "events"
+        self.capture = capture  # record image responses over DevTools while rendering
+        self.cache = cache      # rendered HTML from earlier runs, so reruns can skip the browser
+        self.phase_timings: Dict[str, float] = {}
+        self.current_url: str = notion_url
+        self._driver = None
+
+    @property
+    def driver(self):
+        """The browser, started on first use so cached renders never launch one."""
+        if self._driver is None:
+            with self.metrics.phase(self.current_url, "driver"):
+                self._driver = self._build_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value) -> None:
+        self._driver = value
 
     # ---- Driver provisioning strategy ----
     def _build_driver(self):
         if self.browser == "edge":
-            return self._build_edge_driver()
-        # default: chrome
-        return self._build_chrome_driver()
+            driver = self._build_edge_driver()
+        else:  # default: chrome
+            driver = self._build_chrome_driver()
+        if self.capture is not None:
+            driver.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": CAPTURE_BUFFER_BYTES,
+                                                      "maxResourceBufferSize": CAPTURE_RESOURCE_BYTES})
+        return driver
 
     def _build_chrome_driver(self):
         options = ChromeOptions()
@@ -179,6 +1262,8 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
         options.add_argument("--disable-blink-features=AutomationControlled")
         if self.user_agent:
             options.add_argument(f"user-agent={self.user_agent}")
+        if self.capture is not None:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         if self.chrome_path:
             options.binary_location = self.chrome_path
 
@@ -216,6 +1301,8 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
         options.add_argument("--disable-blink-features=AutomationControlled")
         if self.user_agent:
             options.add_argument(f"user-agent={self.user_agent}")
+        if self.capture is not None:
+            options.set_capability("ms:loggingPrefs", {"performance": "ALL"})
         if self.edge_path:
             options.binary_location = self.edge_path
 
@@ -244,12 +1331,14 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
             ) from wdm_err
 
     # ---- Helpers to render the Notion page ----
-    def _expand_all_toggles(self, timeout: int = 20):
+    def _expand_all_toggles(self, timeout: int = 20) -> List[int]:
+        """Click collapsed toggles one by one; return how many were clicked per pass."""
         wait = WebDriverWait(self.driver, timeout)
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
+        per_pass: List[int] = []
         for _ in range(5):
-            clicked = False
+            clicked = 0
 
             # aria-expanded="false"
             toggles = self.driver.find_elements(By.XPATH, "//*[@aria-expanded='false']")
@@ -257,7 +1346,7 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
                 try:
                     self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
                     time.sleep(0.1); el.click(); time.sleep(0.1)
-                    clicked = True
+                    clicked += 1
                 except Exception:
                     pass
 
@@ -267,7 +1356,7 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
                 try:
                     self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
                     time.sleep(0.1); el.click(); time.sleep(0.1)
-                    clicked = True
+                    clicked += 1
                 except Exception:
                     pass
 
@@ -285,16 +1374,21 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
                         continue
                     self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
                     time.sleep(0.1); el.click(); time.sleep(0.1)
-                    clicked = True
+                    clicked += 1
                 except Exception:
                     pass
 
+            per_pass.append(clicked)
             if not clicked:
                 break
+        return per_pass
 
-    def _slow_full_scroll(self, passes: int = MAX_SCROLL_PASSES, pause: float = SCROLL_PAUSE):
+    def _slow_full_scroll(self, passes: int = MAX_SCROLL_PASSES, pause: float = SCROLL_PAUSE) -> int:
+        """Scroll to the bottom until the height stops growing; return passes used."""
         last_height = self.driver.execute_script("return document.body.scrollHeight;")
+        used = 0
         for _ in range(passes):
+            used += 1
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(pause)
             new_height = self.driver.execute_script("return document.body.scrollHeight;")
@@ -303,29 +1397,574 @@ class SeleniumNotionImageScraper(BaseNotionImageScraper):
             last_height = new_height
         self.driver.execute_script("window.scrollTo(0, 0);")
         time.sleep(pause)
+        return used
+
+    # ---- Event-driven rendering ----
+    def _wait_for_dom_quiet(self, quiet_ms: int = DOM_QUIET_MS,
+                            timeout: float = RENDER_WAIT_TIMEOUT) -> None:
+        self.driver.execute_async_script(WAIT_FOR_DOM_QUIET_JS, quiet_ms, int(timeout * 1000))
+
+    def _expand_all_toggles_batched(self, passes: int = MAX_TOGGLE_PASSES) -> List[int]:
+        """
+        Open toggles level by level, one script call per level; return clicks per level.
+        Finding nothing on the first pass may just mean the page is still hydrating,
+        so that gets one more look after the DOM settles.
+        """
+        per_pass: List[int] = []
+        for _ in range(passes):
+            clicked = self.driver.execute_script(EXPAND_TOGGLES_JS)
+            per_pass.append(clicked)
+            if not clicked and len(per_pass) > 1:
+                break
+            self._wait_for_dom_quiet()
+        return per_pass
+
+    def _scroll_until_stable(self, passes: int = MAX_SCROLL_PASSES) -> int:
+        last_height = self.driver.execute_script("return document.body.scrollHeight;")
+        used = 0
+        for _ in range(passes):
+            used += 1
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self._wait_for_dom_quiet()
+            new_height = self.driver.execute_script("return document.body.scrollHeight;")
+            if new_height == last_height:
+                break
+            last_height = new_height
+        self.driver.execute_script("window.scrollTo(0, 0);")
+        return used
+
+    def _wait_for_images(self, timeout: float = RENDER_WAIT_TIMEOUT) -> int:
+        pending = self.driver.execute_async_script(WAIT_FOR_IMAGES_JS, int(timeout * 1000))
+        if pending:
+            print(f"[WARN] {pending} images still loading after {timeout:.0f}s")
+        return pending
+
+    def _render_event_driven(self) -> None:
+        # Each in-page wait carries its own timeout; give the driver a little slack on top.
+        self.driver.set_script_timeout(RENDER_WAIT_TIMEOUT + 5)
+        with self._phase("toggles"):
+            self._wait_for_dom_quiet()  # <body> exists well before Notion has rendered the blocks
+            toggles = self._expand_all_toggles_batched()
+        with self._phase("scroll"):
+            scrolls = self._scroll_until_stable()
+        with self._phase("images"):
+            pending = self._wait_for_images()
+        self.metrics.record(self.current_url, toggles_per_pass=toggles, scroll_passes=scrolls,
+                            images_pending=pending)
+
+    # ---- Session-range rendering ----
+    def _scroll_until_past_range(self, passes: int = MAX_SCROLL_PASSES) -> Tuple[int, int]:
+        """
+        Like _scroll_until_stable, but stops as soon as a heading after the wanted range
+        has loaded. Returns (passes used, in-range headings found).
+        """
+        used = 0
+        state = self.driver.execute_script(RANGE_SCROLL_STATE_JS, *self.session_range)
+        for _ in range(passes):
+            if state["passed"]:
+                break
+            used += 1
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self._wait_for_dom_quiet()
+            last_height = state["height"]
+            state = self.driver.execute_script(RANGE_SCROLL_STATE_JS, *self.session_range)
+            if state["height"] == last_height:
+                break
+        self.driver.execute_script("window.scrollTo(0, 0);")
+        return used, state["wanted"]
+
+    def _expand_range_toggles(self, passes: int = MAX_TOGGLE_PASSES) -> List[int]:
+        """_expand_all_toggles_batched restricted to toggles under in-range headings."""
+        per_pass: List[int] = []
+        for _ in range(passes):
+            clicked = self.driver.execute_script(EXPAND_RANGE_TOGGLES_JS, *self.session_range)
+            per_pass.append(clicked)
+            if not clicked:
+                break
+            self._wait_for_dom_quiet()
+        return per_pass
+
+    def _render_targeted(self) -> None:
+        # Headings are visible while collapsed, so find the range first, then open only its toggles.
+        self.driver.set_script_timeout(RENDER_WAIT_TIMEOUT + 5)
+        with self._phase("scroll"):
+            scrolls, wanted = self._scroll_until_past_range()
+        self.range_found = bool(wanted)
+        if not self.range_found:
+            # e.g. a crawled sub-page, which belongs to its parent's session as a whole
+            print("[INFO] No heading in the requested session range; rendering the whole page.")
+            self._render_event_driven()
+            return
+        with self._phase("toggles"):
+            toggles = self._expand_range_toggles()
+        with self._phase("images"):
+            pending = self._wait_for_images()
+        self.metrics.record(self.current_url, toggles_per_pass=toggles, scroll_passes=scrolls,
+                            images_pending=pending)
+
+    def _range_html(self) -> Optional[str]:
+        """Just the in-range part of the rendered DOM, or None if no wanted heading was found."""
+        if not self.range_found:
+            return None
+        fragment = self.driver.execute_script(EXTRACT_RANGE_HTML_JS, *self.session_range)
+        return None if fragment is None else f"<html><body>{fragment}</body></html>"
+
+    # ---- Network capture ----
+    def _capture_images(self) -> int:
+        """
+        Spool the bodies of image responses logged since the page load into self.capture,
+        keyed by every URL that led to them. Returns how many were captured; bodies the
+        browser has already evicted are left for the HTTP fallback.
+        """
+        chains: Dict[str, List[str]] = defaultdict(list)
+        responses: Dict[str, dict] = {}
+        finished = set()
+        for record in self.driver.get_log("performance"):
+            event = json.loads(record["message"]).get("message") or {}
+            method, params = event.get("method"), event.get("params") or {}
+            if method == "Network.requestWillBeSent":
+                chains[params.get("requestId")].append(params.get("request", {}).get("url", ""))
+            elif method == "Network.responseReceived" and params.get("type") == "Image":
+                responses[params.get("requestId")] = params.get("response") or {}
+            elif method == "Network.loadingFinished":
+                finished.add(params.get("requestId"))
+
+        captured = 0
+        for request_id, response in responses.items():
+            if response.get("status") != 200 or request_id not in finished:
+                continue
+            try:
+                reply = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception:
+                continue
+            body = base64.b64decode(reply["body"]) if reply.get("base64Encoded") else reply["body"].encode("utf-8")
+            urls = [u for u in chains[request_id] if u] + [response.get("url", "")]
+            self.capture.add([u for u in urls if u], body, response.get("mimeType", ""), response.get("headers"))
+            captured += 1
+
+        # The extractors see src/data-src/srcset, which can differ from what was fetched.
+        for current, *sources in self.driver.execute_script(IMAGE_SOURCES_JS) or []:
+            if current:
+                self.capture.alias(current, [u for u in sources if u and u != current])
+        return captured
+
+    def _render_fixed(self) -> None:
+        with self._phase("toggles"):
+            toggles = self._expand_all_toggles()
+        with self._phase("settle"):
+            time.sleep(5)
+        with self._phase("scroll"):
+            scrolls = self._slow_full_scroll()
+        with self._phase("lazy-load"):
+            time.sleep(5)  # settle lazy-loads
+        self.metrics.record(self.current_url, toggles_per_pass=toggles, scroll_passes=scrolls)
+
+    @contextmanager
+    def _phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            secs = time.perf_counter() - start
+            self.phase_timings[name] = secs
+            self.metrics.add_phase(self.current_url, name, secs)
+
+    def cache_variant(self) -> str:
+        """What besides the URL shapes the returned HTML: targeted renders only hold their range."""
+        if self.render_mode != "targeted":
+            return ""
+        lo, hi = self.session_range
+        return f"sessions {'' if lo is None else lo}-{'' if hi is None else hi}"
+
+    def render(self, url: str) -> str:
+        """
+        Render one page on this scraper's driver and return its HTML; the driver stays open.
+        A fresh snapshot in the render cache is returned instead, without touching the browser.
+        """
+        self.phase_timings = {}
+        self.current_url = url
+        if self.cache is not None:
+            with self._phase("cache"):
+                html = self.cache.get(url, self.cache_variant())
+            if html is not None:
+                print(f"[INFO] Using cached render of {url} "
+                      f"({self.cache.age(url, self.cache_variant()) / 60:.0f} min old; --refresh to re-render)")
+                self.metrics.record(url, cache_hit=True, rendered_bytes=len(html.encode("utf-8")))
+                return html
+        if self.capture is not None:
+            self.driver.get_log("performance")  # drop the previous page's events
+        try:
+            with self._phase("load"):
+                self.driver.get(url)
+                WebDriverWait(self.driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            if self.render_mode == "fixed":
+                self._render_fixed()
+            elif self.render_mode == "targeted":
+                self._render_targeted()
+            else:
+                self._render_event_driven()
+            html = (self._range_html() if self.render_mode == "targeted" else None) or self.driver.page_source
+            if self.capture is not None:
+                with self._phase("capture"):
+                    captured = self._capture_images()
+                self.metrics.record(url, images_captured=captured)
+            if self.cache is not None:
+                self.cache.put(url, html, self.cache_variant())
+            self.metrics.record(url, rendered_bytes=len(html.encode("utf-8")))
+            return html
+        finally:
+            for name, secs in self.phase_timings.items():
+                print(f"[TIME] {name}: {secs:.2f}s")
+
+    def recycle_driver(self) -> None:
+        """Replace a crashed or wedged driver with a fresh one."""
+        self.quit()
+        with self.metrics.phase(self.current_url, "driver"):
+            self.driver = self._build_driver()
+
+    def quit(self) -> None:
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+        self._driver = None
 
     def get_fully_rendered_html(self) -> str:
         try:
-            self.driver.get(self.notion_url)
-            WebDriverWait(self.driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            self._expand_all_toggles()
-            time.sleep(5) 
-            self._slow_full_scroll()
-            time.sleep(5)  # settle lazy-loads
-            return self.driver.page_source
+            return self.render(self.notion_url)
+        finally:
+            self.quit()
+
+# --------------------------- Driver Pool -------------------------------------
+class PooledSeleniumScraper(CrawlingNotionScraper):
+    """
+    Renders several Notion pages in parallel on a pool of reusable drivers, built
+    with the same options (headless or not) as the single-page scraper. Each
+    worker thread provisions its driver once and keeps it across pages; a driver
+    that fails is recycled and the page retried. Finished pages are handed back in
+    input order so image numbering stays deterministic while later pages still render.
+    """
+
+    def __init__(self,
+                 notion_urls: List[str],
+                 output_root: str,
+                 pool_size: int = 2,
+                 max_retries: int = 1,
+                 workers: int = DOWNLOAD_WORKERS,
+                 per_host: int = MAX_CONNECTIONS_PER_HOST,
+                 store: Optional[BlobStore] = None,
+                 metrics: Optional[ScrapeMetrics] = None,
+                 retries: int = MAX_RETRIES,
+                 max_rate: Optional[float] = None,
+                 **driver_options):
+        super().__init__(notion_urls[0], output_root, workers=workers, per_host=per_host,
+                         store=store, metrics=metrics, retries=retries, max_rate=max_rate)
+        self.notion_urls = list(notion_urls)
+        self.pool_size = max(1, pool_size)
+        self.max_retries = max(0, max_retries)
+        self.driver_options = driver_options
+        self.capture = driver_options.get("capture")  # shared by every renderer in the pool
+
+    def render_all(self, urls: List[str]):
+        """Yield (url, html) in input order; html is None for pages that kept failing."""
+        local = threading.local()
+        renderers: List[SeleniumNotionImageScraper] = []
+        lock = threading.Lock()
+
+        def render(url: str) -> Tuple[str, Optional[str]]:
+            for attempt in range(self.max_retries + 1):
+                renderer = getattr(local, "renderer", None)
+                try:
+                    if renderer is None:
+                        renderer = SeleniumNotionImageScraper(url, str(self.output_root), metrics=self.metrics,
+                                                              **self.driver_options)
+                        local.renderer = renderer
+                        with lock:
+                            renderers.append(renderer)
+                    return url, renderer.render(url)
+                except Exception as e:
+                    print(f"[WARN] Render failed for {url} (attempt {attempt + 1}): {e}")
+                    if renderer is not None:
+                        try:
+                            renderer.recycle_driver()
+                        except Exception as build_err:
+                            print(f"[WARN] Could not rebuild driver: {build_err}")
+            return url, None
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(urls))) as pool:
+                yield from pool.map(render, urls)
         finally:
+            for renderer in renderers:
+                renderer.quit()
+
+    def fetch_pages(self, urls: List[str]) -> Iterator[Tuple[str, Optional[PageItems]]]:
+        for url, html in self.render_all(urls):
+            if html is None:
+                yield url, None
+                continue
+            with self.metrics.phase(url, "parse"):
+                items = self.page_items_from_html(html)
+            yield url, items
+
+    def get_fully_rendered_html(self) -> str:
+        _, html = next(self.render_all([self.notion_url]))
+        if html is None:
+            raise RuntimeError(f"Unable to render {self.notion_url}")
+        return html
+
+    def scrape(self, collect=None, min_session: Optional[int] = None,
+               max_session: Optional[int] = None, revalidate: bool = False) -> int:
+        """Render every URL and download each page's images as soon as it is ready."""
+        offsets: Dict[int, int] = defaultdict(int)
+        total = 0
+        for url, html in self.render_all(self.notion_urls):
+            if html is None:
+                continue
+            images_by_session = self.extract(html, url, collect, min_session, max_session)
+            # Resolve relative sources against the page they came from.
+            images_by_session = {
+                num: [urllib.parse.urljoin(url, src) for src in srcs]
+                for num, srcs in images_by_session.items()
+            }
+            found = sum(len(v) for v in images_by_session.values())
+            print(f"Rendered {url}: {found} images in {len(images_by_session)} sessions")
+            total += self.download_images(images_by_session, revalidate=revalidate,
+                                          start_index=offsets, page_url=url)
+            for num, srcs in images_by_session.items():
+                offsets[num] += len(srcs)
+        return total
+
+# --------------------------- HTTP Scraper ------------------------------------
+class NotionHttpScraper(CrawlingNotionScraper):
+    """
+    Browserless backend: reads the public page's block tree from Notion's page API
+    (loadPageChunk, then syncRecordValues for toggle children the chunk left out) and
+    walks it in document order, so no Chrome, clicking or scrolling is needed.
+    api_base points it at a stand-in server; record_dir saves every API exchange
+    so notion_stub_server.py can replay them.
+    """
+
+    def __init__(self, notion_url: str, output_root: str,
+                 api_base: str = "",
+                 record_dir: str = "",
+                 workers: int = DOWNLOAD_WORKERS,
+                 per_host: int = MAX_CONNECTIONS_PER_HOST,
+                 store: Optional[BlobStore] = None,
+                 metrics: Optional[ScrapeMetrics] = None,
+                 retries: int = MAX_RETRIES,
+                 max_rate: Optional[float] = None):
+        super().__init__(notion_url, output_root, workers=workers, per_host=per_host,
+                         store=store, metrics=metrics, retries=retries, max_rate=max_rate)
+        parts = urllib.parse.urlsplit(notion_url)
+        self.site_base = f"{parts.scheme}://{parts.netloc}"
+        self.image_base = (api_base or self.site_base).rstrip("/")
+        self.api_base = self.image_base + NOTION_API_PATH
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.page_id = self.page_id_from_url(notion_url)
+        self.http = build_http_session(2)
+        self.blocks: Dict[str, dict] = {}
+        self.space_id: Optional[str] = None
+
+    @staticmethod
+    def page_id_from_url(url: str) -> str:
+        """The page id is the trailing 32 hex chars of the URL path, as a dashed UUID."""
+        page_id = notion_page_id(url)
+        if page_id is None:
+            raise ValueError(f"No Notion page id in {url}")
+        return page_id
+
+    # ---- API ----
+    def _post(self, endpoint: str, body: dict) -> dict:
+        with self.metrics.phase(self.notion_url, "api"):
+            r = self.http.post(self.api_base + endpoint, json=body, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        data = r.json()
+        if self.record_dir is not None:
+            ensure_dir(self.record_dir)
+            key = request_key(endpoint, body)
+            with open(self.record_dir / f"{key}.json", "w", encoding="utf-8") as f:
+                json.dump({"endpoint": endpoint, "request": body, "response": data}, f, indent=2)
+        return data
+
+    def _merge_blocks(self, record_map: dict) -> None:
+        for block_id, record in (record_map.get("block") or {}).items():
+            value = record.get("value") or {}
+            if "value" in value and isinstance(value["value"], dict):  # newer, doubly wrapped records
+                value = value["value"]
+            if value:
+                self.blocks[block_id] = value
+                self.space_id = self.space_id or value.get("space_id")
+
+    def load_blocks(self) -> Dict[str, dict]:
+        """Fetch the page's chunks, then any child blocks (e.g. inside toggles) still missing."""
+        cursor: dict = {"stack": []}
+        chunk = 0
+        while True:
+            data = self._post("loadPageChunk", {
+                "pageId": self.page_id, "limit": NOTION_CHUNK_LIMIT,
+                "cursor": cursor, "chunkNumber": chunk, "verticalColumns": False,
+            })
+            self._merge_blocks(data.get("recordMap") or {})
+            cursor = data.get("cursor") or {"stack": []}
+            if not cursor.get("stack"):
+                break
+            chunk += 1
+
+        while True:
+            missing = [cid for cid in self._reachable_ids() if cid not in self.blocks]
+            if not missing:
+                break
+            fetched = len(self.blocks)
+            space = {"spaceId": self.space_id} if self.space_id else {}
+            for i in range(0, len(missing), NOTION_SYNC_BATCH):
+                pointers = [{"pointer": {"table": "block", "id": cid, **space}, "version": -1}
+                            for cid in missing[i:i + NOTION_SYNC_BATCH]]
+                data = self._post("syncRecordValues", {"requests": pointers})
+                self._merge_blocks(data.get("recordMap") or {})
+            if len(self.blocks) == fetched:
+                print(f"[WARN] {len(missing)} blocks could not be loaded")
+                break
+        return self.blocks
+
+    def _children(self, block_id: str) -> List[str]:
+        block = self.blocks.get(block_id) or {}
+        # Sub-pages are separate documents; only the root page's own content is walked.
+        if block_id != self.page_id and block.get("type") in ("page", "collection_view_page"):
+            return []
+        return list(block.get("content") or [])
+
+    def _reachable_ids(self) -> List[str]:
+        seen, order, stack = set(), [], [self.page_id]
+        while stack:
+            block_id = stack.pop()
+            if block_id in seen:
+                continue
+            seen.add(block_id)
+            order.append(block_id)
+            stack.extend(reversed(self._children(block_id)))
+        return order
+
+    # ---- Walk ----
+    @staticmethod
+    def block_text(block: dict) -> str:
+        title = (block.get("properties") or {}).get("title") or []
+        return "".join(part[0] for part in title if part and isinstance(part[0], str))
+
+    def image_url(self, block_id: str, block: dict) -> Optional[str]:
+        source = ((block.get("properties") or {}).get("source") or [[None]])[0][0] \
+            or (block.get("format") or {}).get("display_source")
+        if not source:
+            return None
+        query = {"table": "block", "id": block_id, "cache": "v2"}
+        if self.space_id:
+            query["spaceId"] = self.space_id
+        return (f"{self.image_base}/image/{urllib.parse.quote(source, safe='')}?"
+                f"{urllib.parse.urlencode(query)}")
+
+    def page_url(self, page_id: str) -> str:
+        return f"{self.site_base}/{page_id.replace('-', '')}"
+
+    def iter_page_items(self):
+        """Yield ("image" | "link", session number or None, URL) in page order."""
+        if not self.blocks:
+            self.load_blocks()
+        current: Optional[int] = None
+        for block_id in self._reachable_ids():
+            block = self.blocks.get(block_id) or {}
+            maybe = session_number_from_text(self.block_text(block))
+            if maybe is not None:
+                current = maybe
+            kind = block.get("type")
+            if kind == "image":
+                url = self.image_url(block_id, block)
+                if url:
+                    yield "image", current, url
+            elif kind in ("page", "collection_view_page") and block_id != self.page_id:
+                yield "link", current, self.page_url(block_id)
+            elif kind == "alias":  # "link to page" block
+                target = ((block.get("format") or {}).get("alias_pointer") or {}).get("id")
+                if target:
+                    yield "link", current, self.page_url(target)
+
+    def iter_session_images(self):
+        """Yield (session number, image URL) in page order."""
+        for kind, session, url in self.iter_page_items():
+            if kind == "image" and session is not None:
+                yield session, url
+
+    def fetch_pages(self, urls: List[str]) -> Iterator[Tuple[str, Optional[PageItems]]]:
+        def fetch(url: str) -> Tuple[str, Optional[PageItems]]:
+            page = self if url == self.notion_url else NotionHttpScraper(
+                url, str(self.output_root), record_dir=self.record_dir or "", metrics=self.metrics,
+                api_base=self.image_base if self.image_base != self.site_base else "")
             try:
-                self.driver.quit()
-            except Exception:
-                pass
+                items: PageItems = ([], [])
+                for kind, session, item_url in page.iter_page_items():
+                    items[kind == "link"].append((session, item_url))
+                return url, items
+            except Exception as e:
+                print(f"[WARN] Could not load {url}: {e}")
+                return url, None
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as pool:
+            yield from pool.map(fetch, urls)
+
+    def collect_images(self, min_session: Optional[int] = None,
+                       max_session: Optional[int] = None) -> Dict[int, List[str]]:
+        if not self.blocks:
+            self.load_blocks()
+        imgs: Dict[int, List[str]] = defaultdict(list)
+        with self.metrics.phase(self.notion_url, "parse"), self.metrics.profiling():
+            for session, url in self.iter_session_images():
+                if (min_session is None or session >= min_session) and \
+                   (max_session is None or session <= max_session):
+                    imgs[session].append(url)
+        self.metrics.record(self.notion_url, blocks=len(self.blocks),
+                            images_found=sum(len(v) for v in imgs.values()))
+        return imgs
+
+    def get_fully_rendered_html(self) -> str:
+        """Minimal HTML with the same session/image structure, for the HTML-based tools."""
+        out, current = [], None
+        for session, url in self.iter_session_images():
+            if session != current:
+                out.append(f"<h2>Session {session}</h2>")
+                current = session
+            out.append(f'<img src="{html_lib.escape(url)}">')
+        return "<html><body>" + "\n".join(out) + "</body></html>"
+
+def request_key(endpoint: str, body: dict) -> str:
+    """Stable name for a recorded API exchange."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return f"{endpoint}-{hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]}"
 
 # --------------------------- CLI / Main --------------------------------------
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Download images from a Notion page organized by 'Session {n}' headings.")
-    parser.add_argument("-u", "--url", type=str, help="Notion page URL.")
+    parser.add_argument("-u", "--url", type=str, nargs="+", help="Notion page URL(s).")
     parser.add_argument("-o", "--output", type=str, help="Output root directory.", default=BASE_IMG_DIR)
     parser.add_argument("--min-session", type=int, default=None, help="Only download from sessions >= this number.")
     parser.add_argument("--max-session", type=int, default=None, help="Only download from sessions <= this number.")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help="Concurrent image downloads.")
+    parser.add_argument("--per-host", type=int, default=MAX_CONNECTIONS_PER_HOST,
+                        help="Max concurrent connections to a single image host.")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES,
+                        help="Retries per image for timeouts, 429 and 5xx responses (with backoff).")
+    parser.add_argument("--max-rate", type=float, default=0,
+                        help="Cap requests/s per image host (default: unpaced until the host throttles).")
+    parser.add_argument("--extractor", type=str, default="stream", choices=["stream", "tree"],
+                        help="Session/image extractor: single-pass 'stream' or the original BeautifulSoup 'tree'.")
+    parser.add_argument("--store", type=str, default="",
+                        help="Content-addressed blob store; saved images become links into it.")
+    parser.add_argument("--link-mode", type=str, default="hardlink", choices=LINK_MODES,
+                        help="How image paths point into --store.")
+    parser.add_argument("--optimize", action="store_true",
+                        help="After downloading, build resized WebP/AVIF variants (needs Pillow).")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Re-check images already in the sync manifest with conditional requests.")
 
     # Browser/driver options (mirroring your Substack script style)
     parser.add_argument("--browser", type=str, default="edge", choices=["chrome", "edge"], help="Browser to automate.")
@@ -335,18 +1974,91 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--edge-path", type=str, default="", help="Path to msedge.exe (optional).")
     parser.add_argument("--edge-driver-path", type=str, default="", help="Path to msedgedriver.exe (optional).")
     parser.add_argument("--user-agent", type=str, default="", help="Custom user agent (optional).")
-    return parser.parse_args()
+    parser.add_argument("--backend", type=str, default="selenium", choices=["selenium", "http"],
+                        help="Render with a browser, or read the page's blocks over plain HTTP.")
+    parser.add_argument("--api-base", type=str, default="",
+                        help="HTTP backend: alternative API host, e.g. a local notion_stub_server.py.")
+    parser.add_argument("--record", type=str, default="",
+                        help="HTTP backend: save every API response here for offline replay.")
+    parser.add_argument("--browsers", type=int, default=None,
+                        help="Browser drivers rendering pages in parallel (used with several --url or --crawl-depth; "
+                             f"default 1, or {CRAWL_BROWSERS} when crawling).")
+    parser.add_argument("--crawl-depth", type=int, default=0,
+                        help="Also follow Notion sub-page links under 'Session {n}' headings this many levels deep; "
+                             "their images go to that session.")
+    parser.add_argument("--capture", action="store_true",
+                        help="Keep the image bodies the browser loads while rendering (DevTools network log) "
+                             "and only download what it missed.")
+    parser.add_argument("--cache-dir", type=str, default=str(RENDER_CACHE_DIR),
+                        help="Where rendered pages are cached between runs.")
+    parser.add_argument("--cache-ttl", type=float, default=RENDER_CACHE_TTL,
+                        help="Seconds a cached render is reused (0 disables the cache).")
+    parser.add_argument("--cache-max-mb", type=float, default=RENDER_CACHE_MAX_BYTES / 1e6,
+                        help="Evict least recently used renders beyond this many compressed MB.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached renders (new renders still replace them).")
+    parser.add_argument("--render", type=str, default="events", choices=["events", "targeted", "fixed"],
+                        help="Wait for DOM/image events; 'targeted' also only opens and returns the "
+                             "--min-session/--max-session range; 'fixed' uses the original sleeps.")
+    parser.add_argument("--metrics", type=str, default="",
+                        help="Write a JSON report of phase timings, render counters and per-image latency/bytes.")
+    parser.add_argument("--profile", type=str, default="",
+                        help="Run the HTML parse phase under cProfile and dump the stats to this file.")
+    args = parser.parse_args()
+    if args.crawl_depth and args.extractor == "tree":
+        parser.error("--crawl-depth follows links found by the 'stream' extractor; drop --extractor tree.")
+    return args
 
-def main():
-    args = parse_args()
-    notion_url = args.url or BASE_NOTION_URL
+def run_optimize(args: argparse.Namespace) -> None:
+    if not args.optimize:
+        return
+    try:
+        from optimize_images import optimize_tree
+    except ImportError as e:
+        raise SystemExit(f"--optimize needs Pillow: {e}") from e
+    stats = optimize_tree(Path(args.output))
+    print(f"Optimised {stats['processed']} images ({stats['skipped']} unchanged).")
+
+def run_scrape(args: argparse.Namespace, metrics: ScrapeMetrics) -> None:
+    notion_urls = args.url or [BASE_NOTION_URL]
+
+    download_options = dict(
+        workers=args.workers,
+        per_host=args.per_host,
+        store=BlobStore(Path(args.store), args.link_mode) if args.store else None,
+        metrics=metrics,
+        retries=args.retries,
+        max_rate=args.max_rate or None,
+    )
+
+    if args.backend == "http" and args.crawl_depth:
+        scraper = NotionHttpScraper(notion_urls[0], args.output, api_base=args.api_base,
+                                    record_dir=args.record, **download_options)
+        total = scraper.crawl_and_download(args.crawl_depth, args.min_session, args.max_session,
+                                           revalidate=args.revalidate, urls=notion_urls)
+        print(f"\nDone. Saved {total} images.")
+        run_optimize(args)
+        return
+
+    if args.backend == "http":
+        offsets: Dict[int, int] = defaultdict(int)
+        total = 0
+        for url in notion_urls:
+            scraper = NotionHttpScraper(url, args.output, api_base=args.api_base,
+                                        record_dir=args.record, **download_options)
+            images_by_session = scraper.collect_images(args.min_session, args.max_session)
+            total += scraper.download_images(images_by_session, revalidate=args.revalidate,
+                                             start_index=offsets, page_url=url)
+            for num, srcs in images_by_session.items():
+                offsets[num] += len(srcs)
+        print(f"\nDone. Saved {total} images.")
+        run_optimize(args)
+        return
 
     if not USE_SELENIUM:
         raise SystemExit("This script expects Selenium to render Notion (toggles/lazy images). Set USE_SELENIUM=True.")
 
-    scraper = SeleniumNotionImageScraper(
-        notion_url=notion_url,
-        output_root=args.output,
+    driver_options = dict(
         browser=args.browser,
         headless=args.headless,
         chrome_path=args.chrome_path,
@@ -354,18 +2066,66 @@ def main():
         edge_path=args.edge_path,
         edge_driver_path=args.edge_driver_path,
         user_agent=args.user_agent,
+        render_mode=args.render,
+        min_session=args.min_session,
+        max_session=args.max_session,
+        capture=NetworkCapture(Path(args.output)) if args.capture else None,
+        cache=RenderCache(Path(args.cache_dir), args.cache_ttl, int(args.cache_max_mb * 1e6), args.refresh)
+        if args.cache_ttl > 0 else None,
     )
+    try:
+        run_selenium_scrape(args, notion_urls, download_options, driver_options)
+    finally:
+        if driver_options["capture"] is not None:
+            driver_options["capture"].close()
+    run_optimize(args)
 
-    html = scraper.get_fully_rendered_html()
-    images_by_session = BaseNotionImageScraper.collect_images_by_session(
-        html, min_session=args.min_session, max_session=args.max_session
-    )
-    if not images_by_session:
-        print("No images found. Try increasing MAX_SCROLL_PASSES or verify 'Session {n}' headings.")
-        return
+def run_selenium_scrape(args: argparse.Namespace, notion_urls: List[str],
+                        download_options: dict, driver_options: dict) -> None:
+    collect = (BaseNotionImageScraper.collect_images_by_session_tree if args.extractor == "tree"
+               else BaseNotionImageScraper.collect_images_by_session)
+
+    if args.crawl_depth:
+        pool = PooledSeleniumScraper(
+            notion_urls, args.output, pool_size=args.browsers or CRAWL_BROWSERS,
+            **download_options, **driver_options
+        )
+        total = pool.crawl_and_download(args.crawl_depth, args.min_session, args.max_session,
+                                        revalidate=args.revalidate, urls=notion_urls)
+        print(f"\nDone. Saved {total} images.")
+    elif len(notion_urls) > 1 or (args.browsers or 1) > 1:
+        pool = PooledSeleniumScraper(
+            notion_urls, args.output, pool_size=args.browsers or 1, **download_options, **driver_options
+        )
+        total = pool.scrape(collect, args.min_session, args.max_session, revalidate=args.revalidate)
+        print(f"\nDone. Saved {total} images from {len(notion_urls)} pages.")
+    else:
+        scraper = SeleniumNotionImageScraper(
+            notion_url=notion_urls[0],
+            output_root=args.output,
+            **driver_options,
+            **download_options,
+        )
 
-    total = scraper.download_images(images_by_session)
-    print(f"\nDone. Saved {total} images.")
+        html = scraper.get_fully_rendered_html()
+        images_by_session = scraper.extract(
+            html, scraper.notion_url, collect, min_session=args.min_session, max_session=args.max_session
+        )
+        if not images_by_session:
+            print("No images found. Try increasing MAX_SCROLL_PASSES or verify 'Session {n}' headings.")
+            return
+
+        total = scraper.download_images(images_by_session, revalidate=args.revalidate)
+        print(f"\nDone. Saved {total} images.")
+
+def main():
+    args = parse_args()
+    metrics = ScrapeMetrics(profile_path=args.profile)
+    try:
+        run_scrape(args, metrics)
+    finally:
+        if args.metrics or args.profile:
+            metrics.write(args.metrics)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
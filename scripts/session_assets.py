@@ -0,0 +1,195 @@
+"""
+Shared helpers for the scripts that read and write session image folders
+(src/data/sessions/session{N}/...).
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Container, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# The site's session folders, which SessionsList.jsx reads at build time
+SITE_SESSIONS_DIR = Path(__file__).resolve().parent.parent / "src" / "data" / "sessions"
+# Where scrape_images_from_notion.py writes by default (BASE_IMG_DIR, run from scripts/)
+SCRAPER_SESSIONS_DIR = Path(__file__).resolve().parent / "sessions"
+# The session write-ups, which index.astro parses with sessions-parser.js
+SITE_SESSIONS_MD = Path(__file__).resolve().parent.parent / "src" / "data" / "sessions.md"
+
+# Same extensions SessionsList.jsx picks up with import.meta.glob
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+SESSION_DIR_RE = re.compile(r"^session(\d+)$")
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def iter_session_images(root: Path, sessions: Optional[Container[int]] = None) -> Iterator[Tuple[int, Path]]:
+    """
+    Yield (session number, path) for images directly inside root/session{N}/, in stable order.
+    `sessions` limits the walk to those folders.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return
+    dirs = []
+    for d in root.iterdir():
+        m = SESSION_DIR_RE.match(d.name)
+        if m and d.is_dir() and (sessions is None or int(m.group(1)) in sessions):
+            dirs.append((int(m.group(1)), d))
+    for num, d in sorted(dirs):
+        for p in sorted(d.iterdir(), key=lambda p: p.name):
+            if p.is_file() and p.suffix.lower() in IMAGE_EXTS:
+                yield num, p
+
+def session_of(rel: str) -> Optional[int]:
+    """Session number of a root-relative path like 'session12/image3.png'."""
+    m = SESSION_DIR_RE.match(rel.split("/", 1)[0])
+    return int(m.group(1)) if m else None
+
+def is_session_image(root: Path, path: Path) -> Optional[int]:
+    """Session number if path is an image directly inside root/session{N}/ (what iter_session_images yields)."""
+    try:
+        rel = Path(path).relative_to(root)
+    except ValueError:
+        return None
+    if len(rel.parts) != 2 or rel.suffix.lower() not in IMAGE_EXTS:
+        return None
+    return session_of(rel.as_posix())
+
+# Same heading/body split as parseSessionsMarkdown in src/utils/sessions-parser.js
+SESSION_SECTION_RE = re.compile(
+    r"(?:^|\n)##\s*Session\s+(\d+)([^\n]*)\n([\s\S]*?)(?=(?:\n##\s*Session\s+\d+)|\n?\Z)"
+)
+
+def parse_sessions_markdown(markdown: str) -> List[Dict]:
+    """
+    Python port of parseSessionsMarkdown: [{number, title, content}], newest first,
+    with '-'/'*' bullets turned into '• ' and blank lines dropped.
+    """
+    src = markdown.replace("\ufeff", "").replace("\r\n", "\n").replace("\r", "\n")
+    sessions = []
+    for m in SESSION_SECTION_RE.finditer(src):
+        title = re.sub(r"^[\s:–—-]+", "", (m.group(2) or "").strip()).strip()
+        lines = []
+        for line in (m.group(3) or "").strip().split("\n"):
+            if not re.match(r"^\s*!\[", line) and not re.match(r"^\s*#+\s", line) \
+                    and re.match(r"^\s*[-*]\s+", line):
+                line = "• " + re.sub(r"^\s*[-*]\s+", "", line)
+            lines.append(line)
+        sessions.append({
+            "number": int(m.group(1)),
+            "title": title,
+            "content": "\n".join(l for l in lines if l.strip()),
+        })
+    sessions.sort(key=lambda s: -s["number"])
+    return sessions
+
+def load_json(path: Path, default=None):
+    """Read a JSON file, returning default if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Ignoring unreadable {path}: {e}")
+        return default
+
+def write_json_atomic(path: Path, payload) -> None:
+    """Write JSON via a temp file + rename so readers never see a half-written file."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+def update_image_manifest(root: Path, name: str, settings: Dict, worker: Callable[..., dict],
+                          worker_args: Sequence = (),
+                          workers: Optional[int] = None,
+                          force: bool = False,
+                          sessions: Optional[Container[int]] = None,
+                          dedupe: bool = False,
+                          is_fresh: Callable[[dict], bool] = lambda entry: True,
+                          on_replace: Optional[Callable[[Optional[dict], Optional[dict]], None]] = None,
+                          ) -> Dict[str, int]:
+    """
+    Bring root/<name> up to date: one entry per session image, keyed by path
+    relative to root, holding its sha256 plus whatever worker(str(root), rel,
+    *worker_args) returned. The worker runs in a process pool, only for images
+    whose sha256 no longer matches their entry (or whose entry fails is_fresh);
+    a change in `settings`, which are stored alongside the entries, redoes them
+    all. With dedupe, identical files share one worker call. Entries for images
+    that disappeared are dropped. on_replace(old, new) sees every entry that is
+    overwritten or dropped (new is None), e.g. to delete files it pointed to.
+    `sessions` limits the work to those folders.
+    """
+    root = Path(root)
+    manifest = load_json(root / name, {}) or {}
+    entries: Dict[str, dict] = manifest.get("images", {})
+    if any(manifest.get(k) != v for k, v in settings.items()):
+        force = True  # settings changed; every entry is stale
+
+    known: Dict[str, dict] = {} if force or not dedupe else {
+        e["sha256"]: e for e in entries.values() if "sha256" in e
+    }
+    digests: Dict[str, str] = {}       # rel -> sha256, for images being (re)built
+    jobs: Dict[str, List[str]] = {}    # sha256 (dedupe) or rel -> rels sharing the result
+    seen = set()
+    skipped = 0
+    for _, path in iter_session_images(root, sessions):
+        rel = path.relative_to(root).as_posix()
+        seen.add(rel)
+        digest = file_sha256(path)
+        entry = entries.get(rel)
+        if not force and entry and entry.get("sha256") == digest and is_fresh(entry):
+            skipped += 1
+            continue
+        if digest in known:
+            entries[rel] = dict(known[digest])
+            skipped += 1
+            continue
+        digests[rel] = digest
+        jobs.setdefault(digest if dedupe else rel, []).append(rel)
+
+    removed = 0
+    for rel in [r for r in entries if r not in seen]:
+        if sessions is None or session_of(rel) in sessions:
+            old = entries.pop(rel)
+            if on_replace:
+                on_replace(old, None)
+            removed += 1
+
+    failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {pool.submit(worker, str(root), rels[0], *worker_args): rels for rels in jobs.values()}
+            for fut in as_completed(futures):
+                rels = futures[fut]
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    print(f"[WARN] Failed to process {rels[0]}: {e}")
+                    failed += 1
+                    continue
+                for rel in rels:
+                    entry = {"sha256": digests[rel], **result}
+                    if on_replace:
+                        on_replace(entries.get(rel), entry)
+                    entries[rel] = entry
+
+    write_json_atomic(root / name, {"version": 1, **settings, "images": entries})
+    return {"processed": len(jobs) - failed, "skipped": skipped, "removed": removed, "failed": failed}
+
+def add_build_args(parser: argparse.ArgumentParser) -> None:
+    """The options every update_image_manifest-based script takes."""
+    parser.add_argument("-i", "--input", type=str, default=str(SITE_SESSIONS_DIR),
+                        help="Root holding session{N}/ image folders.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Redo every image, ignoring the manifest.")
@@ -0,0 +1,303 @@
+import argparse
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from session_assets import (
+    SESSION_DIR_RE, SITE_SESSIONS_DIR, SITE_SESSIONS_MD, is_session_image, parse_sessions_markdown,
+)
+
+# --------------------------- Defaults ----------------------------------------
+DEBOUNCE_SECONDS: float = 0.3     # rebuild once events have been quiet this long
+MAX_DEBOUNCE_WAIT: float = 2.0    # ...or this long after the first event, if writes keep coming
+POLL_INTERVAL: float = 0.5        # stat-scan period when watchdog isn't installed
+STAGES = ("download", "optimize", "manifest", "ascii", "shards")
+
+# --------------------------- Change detection --------------------------------
+def section_digests(markdown: Path) -> Dict[int, str]:
+    """sha256 of each '## Session N' section of sessions.md, as parsed for the site."""
+    try:
+        text = Path(markdown).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    return {
+        s["number"]: hashlib.sha256(f"{s['title']}\n{s['content']}".encode("utf-8")).hexdigest()
+        for s in parse_sessions_markdown(text)
+    }
+
+def snapshot_tree(root: Path, markdown: Path) -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) of sessions.md and every image directly inside root/session{N}/."""
+    snap: Dict[str, Tuple[int, int]] = {}
+    paths = [markdown]
+    try:
+        with os.scandir(root) as entries:
+            for d in entries:
+                if SESSION_DIR_RE.match(d.name) and d.is_dir():
+                    with os.scandir(d.path) as files:
+                        paths.extend(f.path for f in files)
+    except FileNotFoundError:
+        pass
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            continue
+        snap[str(p)] = (st.st_mtime_ns, st.st_size)
+    return snap
+
+# --------------------------- Watcher -----------------------------------------
+class SessionWatcher:
+    """
+    Turns file events under the sessions tree and edits to sessions.md into
+    rebuild(sessions, new_sections) calls. Events are coalesced into one set of
+    session numbers and only acted on after DEBOUNCE_SECONDS of quiet, so a burst
+    of saves or a whole folder being copied in costs one rebuild. Uses watchdog
+    when installed, otherwise polls with os.scandir/os.stat.
+    """
+
+    def __init__(self, root: Path, markdown: Path,
+                 rebuild: Callable[[Set[int], Set[int]], None],
+                 debounce: float = DEBOUNCE_SECONDS,
+                 poll_interval: float = POLL_INTERVAL):
+        self.root = Path(root).resolve()
+        self.markdown = Path(markdown).resolve()
+        self.rebuild = rebuild
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.sections = section_digests(self.markdown)
+        self._pending: Set[int] = set()
+        self._markdown_dirty = False
+        self._first_event: Optional[float] = None
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def session_for(self, path: str) -> Optional[int]:
+        p = Path(path)
+        try:
+            rel = p.relative_to(self.root)
+        except ValueError:
+            return None
+        if len(rel.parts) == 1:  # a whole session folder created, removed or renamed
+            m = SESSION_DIR_RE.match(rel.parts[0])
+            return int(m.group(1)) if m else None
+        return is_session_image(self.root, p)
+
+    def notify(self, path: str) -> None:
+        """Record that path changed. Safe to call from any thread."""
+        path = os.path.abspath(path)
+        is_markdown = path == str(self.markdown)
+        session = None if is_markdown else self.session_for(path)
+        if not is_markdown and session is None:
+            return  # manifests, variants/, partial downloads...
+        now = time.monotonic()
+        with self._lock:
+            if is_markdown:
+                self._markdown_dirty = True
+            else:
+                self._pending.add(session)
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+        self._wake.set()
+
+    def _take(self) -> Tuple[Set[int], bool]:
+        with self._lock:
+            sessions, dirty = self._pending, self._markdown_dirty
+            self._pending, self._markdown_dirty = set(), False
+            self._first_event = None
+            self._wake.clear()
+        return sessions, dirty
+
+    def _settled(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            return (now - self._last_event >= self.debounce or
+                    now - self._first_event >= MAX_DEBOUNCE_WAIT)
+
+    def flush(self) -> None:
+        """Run one rebuild for everything pending, diffing sessions.md if it was touched."""
+        sessions, dirty = self._take()
+        new_sections: Set[int] = set()
+        if dirty:
+            digests = section_digests(self.markdown)
+            for num in set(digests) | set(self.sections):
+                if digests.get(num) != self.sections.get(num):
+                    sessions.add(num)
+                    if num not in self.sections:
+                        new_sections.add(num)
+            self.sections = digests
+        if sessions:
+            self.rebuild(sessions, new_sections)
+
+    # ---- Event sources ----
+    def _start_watchdog(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                watcher.notify(event.src_path)
+                if getattr(event, "dest_path", ""):
+                    watcher.notify(event.dest_path)
+
+        observer = Observer()
+        observer.schedule(Handler(), str(self.root), recursive=True)
+        # Editors often save by renaming a temp file over sessions.md, so watch its folder
+        observer.schedule(Handler(), str(self.markdown.parent), recursive=False)
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    def _poll(self) -> None:
+        before = snapshot_tree(self.root, self.markdown)
+        while not self._stop.wait(self.poll_interval):
+            after = snapshot_tree(self.root, self.markdown)
+            for path in set(before) | set(after):
+                if before.get(path) != after.get(path):
+                    self.notify(path)
+            before = after
+
+    def run(self) -> None:
+        """Watch until stop() (or Ctrl+C), rebuilding as changes settle."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        observer = self._start_watchdog()
+        if observer is None:
+            print(f"[INFO] watchdog not installed; polling every {self.poll_interval}s.")
+            threading.Thread(target=self._poll, daemon=True).start()
+        print(f"Watching {self.root} and {self.markdown}")
+        try:
+            while not self._stop.is_set():
+                if not self._wake.wait(0.5):
+                    continue
+                while not self._stop.is_set() and not self._settled():
+                    time.sleep(self.debounce / 4)
+                if not self._stop.is_set():
+                    self.flush()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+# --------------------------- Rebuild -----------------------------------------
+class SessionRebuilder:
+    """
+    Runs the asset stages for just the given sessions: download (new sections only,
+    via the browserless HTTP backend), variants, image manifest and ASCII thumbnails,
+    then re-splits sessions.md into shards (cheap, and unchanged shards keep their bytes).
+    Every stage is incremental, so files the download step just wrote are the only
+    real work left for the others.
+    """
+
+    def __init__(self, root: Path, stages=STAGES, notion_url: str = "", api_base: str = "",
+                 workers: Optional[int] = None, markdown: Path = SITE_SESSIONS_MD,
+                 shards_dir: Optional[Path] = None):
+        self.root = Path(root)
+        self.markdown = Path(markdown)
+        self.shards_dir = Path(shards_dir) if shards_dir else default_shards_dir(self.root)
+        self.stages = [s for s in STAGES if s in stages]
+        self.notion_url = notion_url
+        self.api_base = api_base
+        self.workers = workers
+
+    def download(self, sessions: Set[int]) -> str:
+        from scrape_images_from_notion import BASE_NOTION_URL, NotionHttpScraper
+
+        scraper = NotionHttpScraper(self.notion_url or BASE_NOTION_URL, str(self.root), api_base=self.api_base)
+        found = scraper.collect_images(min(sessions), max(sessions))
+        saved = scraper.download_images({n: srcs for n, srcs in found.items() if n in sessions})
+        return f"{saved} saved"
+
+    def optimize(self, sessions: Set[int]) -> str:
+        from optimize_images import optimize_tree
+
+        return _describe(optimize_tree(self.root, workers=self.workers, sessions=sessions))
+
+    def manifest(self, sessions: Set[int]) -> str:
+        from image_manifest import build_manifest
+
+        return _describe(build_manifest(self.root, workers=self.workers, sessions=sessions))
+
+    def ascii(self, sessions: Set[int]) -> str:
+        from ascii_thumbnails import build_tree
+
+        return _describe(build_tree(self.root, workers=self.workers, sessions=sessions))
+
+    def shards(self, sessions: Set[int]) -> str:
+        from build_session_shards import build_shards
+
+        stats = build_shards(self.markdown, self.root, self.shards_dir)
+        return f"{stats['written']} files written, {stats['removed']} removed"
+
+    def __call__(self, sessions: Set[int], new_sections: Set[int]) -> None:
+        start = time.perf_counter()
+        label = ", ".join(str(n) for n in sorted(sessions))
+        print(f"[INFO] Rebuilding session{'s' if len(sessions) > 1 else ''} {label}")
+        for stage in self.stages:
+            targets = new_sections if stage == "download" else sessions
+            if not targets:
+                continue
+            t0 = time.perf_counter()
+            try:
+                summary = getattr(self, stage)(targets)
+            except Exception as e:
+                print(f"[WARN] {stage} failed for {label}: {e}")
+                continue
+            print(f"  {stage}: {summary} ({time.perf_counter() - t0:.2f}s)")
+        print(f"[INFO] Done in {time.perf_counter() - start:.2f}s")
+
+def default_shards_dir(root: Path) -> Path:
+    """The site's shard folder for the site's sessions tree; root/shards/ for any other tree."""
+    from build_session_shards import SHARDS_DIR
+
+    return SHARDS_DIR if Path(root).resolve() == SITE_SESSIONS_DIR.resolve() else Path(root) / "shards"
+
+def _describe(stats: Dict[str, int]) -> str:
+    return (f"{stats['processed']} processed, {stats['skipped']} unchanged, "
+            f"{stats['removed']} removed, {stats['failed']} failed")
+
+# --------------------------- CLI / Main --------------------------------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Watch sessions.md and the session folders, rebuilding assets for changed sessions only."
+    )
+    parser.add_argument("-i", "--input", type=str, default=str(SITE_SESSIONS_DIR),
+                        help="Root holding session{N}/ image folders.")
+    parser.add_argument("--markdown", type=str, default=str(SITE_SESSIONS_MD), help="Session write-ups to watch.")
+    parser.add_argument("--stages", type=str, nargs="+", default=[s for s in STAGES if s != "download"],
+                        choices=STAGES, help="Steps to run for changed sessions (add 'download' to fetch "
+                                             "images for newly added sections from Notion).")
+    parser.add_argument("--shards-dir", type=str, default="",
+                        help="Where the shards stage writes (default: the site's public/data/sessions for the "
+                             "site tree, otherwise <input>/shards).")
+    parser.add_argument("--url", type=str, default="", help="Notion page to download new sessions from.")
+    parser.add_argument("--api-base", type=str, default="", help="Alternative Notion API origin (e.g. the stub server).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes per stage (default: CPU count).")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, help="Seconds of quiet before rebuilding.")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL,
+                        help="Seconds between scans when watchdog isn't installed.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    rebuild = SessionRebuilder(Path(args.input), args.stages, args.url, args.api_base, args.workers,
+                               Path(args.markdown), args.shards_dir or None)
+    SessionWatcher(Path(args.input), Path(args.markdown), rebuild, args.debounce, args.poll_interval).run()
+
+if __name__ == "__main__":
+    main()
@@ -18,8 +18,10 @@ const SessionsList = ({ sessions = [] }) => {
   // We eagerly import URLs to all images inside src/data/sessions/session{N}/
   const imagesBySession = useMemo(() => {
     // NOTE: pattern is relative to this file. Adjust if you move directories.
+    // Only files directly inside session{N}/: anything deeper (e.g. the
+    // generated variants/) would otherwise be emitted into the build.
     const modules = import.meta.glob(
-      '../data/sessions/**/**/*.{png,jpg,jpeg,webp,gif}',
+      '../data/sessions/session*/*.{png,jpg,jpeg,webp,gif}',
       { eager: true, as: 'url' }
     );
 